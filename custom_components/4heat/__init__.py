@@ -24,6 +24,7 @@ from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
 from .const import DOMAIN
 from .coordinator import FourHeatDataUpdateCoordinator
+from .services import FourHeatServicesSetup
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -34,6 +35,7 @@ _LOGGER = logging.getLogger(__name__)
 # ----------------------------------------------------------------------------
 PLATFORMS: list[Platform] = [
     Platform.CLIMATE,
+    Platform.NUMBER,
     Platform.SENSOR,
     Platform.SWITCH,
 ]
@@ -96,6 +98,13 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> b
         coordinator, cancel_update_listener
     )
 
+    # ----------------------------------------------------------------------------
+    # Setup global services
+    # These are shared by all config entries, so only register them once.
+    # ----------------------------------------------------------------------------
+    if not hass.services.async_services_for_domain(DOMAIN):
+        FourHeatServicesSetup(hass)
+
     # ----------------------------------------------------------------------------
     # Setup platforms (based on the list of entity types in PLATFORMS defined above)
     # This calls the async_setup method in each of your entity type files.
@@ -136,10 +145,6 @@ async def async_unload_entry(hass: HomeAssistant, config_entry: ConfigEntry) ->
     If you have created any custom services, they need to be removed here too.
     """
 
-    # Unload services
-    for service in hass.services.async_services_for_domain(DOMAIN):
-        hass.services.async_remove(DOMAIN, service)
-
     # Unload platforms
     unload_ok = await hass.config_entries.async_unload_platforms(
         config_entry, PLATFORMS
@@ -147,7 +152,13 @@ async def async_unload_entry(hass: HomeAssistant, config_entry: ConfigEntry) ->
 
     # Remove the config entry from the hass data object.
     if unload_ok:
-        hass.data[DOMAIN].pop(config_entry.entry_id)
+        runtime_data: RuntimeData = hass.data[DOMAIN].pop(config_entry.entry_id)
+        await runtime_data.coordinator.async_shutdown()
+
+    # Unload services once the last config entry is gone
+    if not hass.data[DOMAIN]:
+        for service in hass.services.async_services_for_domain(DOMAIN):
+            hass.services.async_remove(DOMAIN, service)
 
     # Return that unloading was successful.
     return unload_ok
@@ -0,0 +1,55 @@
+"""Cache of the IP address of a 4Heat device."""
+
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+STORAGE_VERSION = 1
+
+
+class AddressCache:
+    """Last known IP address of a device, persisted across restarts.
+
+    The address is trusted until its TTL expires. An expired address is still
+    used when it cannot be resolved again, as devices rarely move.
+    """
+
+    def __init__(self, hass: HomeAssistant, code: str, ttl: float) -> None:
+        """Initialise."""
+        self.ttl = ttl
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{code}.address")
+        self._address: dict[str, Any] = {}
+
+    async def async_load(self) -> str | None:
+        """Load the address saved before a restart and return it."""
+        self._address = await self._store.async_load() or {}
+        return self.ip
+
+    @property
+    def ip(self) -> str | None:
+        """Return the cached address."""
+        return self._address.get("ip")
+
+    @property
+    def expired(self) -> bool:
+        """Return if the address should be resolved again."""
+        return time.time() - self._address.get("resolved", 0) > self.ttl
+
+    def set(self, ip: str) -> None:
+        """Store a freshly resolved or confirmed address."""
+        if ip != self.ip or self.expired:
+            self._address = {"ip": ip, "resolved": time.time()}
+            self._store.async_delay_save(lambda: self._address)
+
+    async def async_replace(self, ip: str) -> None:
+        """Store an address entered by the user right away."""
+        self._address = {"ip": ip, "resolved": time.time()}
+        await self._store.async_save(self._address)
+
+    def invalidate(self) -> None:
+        """Expire the address, so it is resolved again before the next use."""
+        self._address["resolved"] = 0
@@ -0,0 +1,76 @@
+"""Streaming statistics of a 4Heat device.
+
+Every aggregate is updated in O(1) from the latest decoded reading, so no
+history has to be scanned to compute them.
+"""
+
+import math
+
+from .const import (
+    DUTY_CYCLE_TIME_CONSTANT,
+    HEAT_UP_RATE_TIME_CONSTANT,
+    IGNITION_STATES,
+    STATE_OFF,
+)
+
+
+class StreamingStatistics:
+    """Incremental aggregates of the stove state and room temperature."""
+
+    def __init__(self) -> None:
+        """Initialise."""
+        self.time_in_state: dict[int, float] = {}
+        self.on_time: float = 0.0
+        self.duty_cycle: float | None = None
+        self.heat_up_rate: float | None = None
+        self.last_ignition_duration: float | None = None
+        self._timestamp: float | None = None
+        self._state: int | None = None
+        self._temperature: float | None = None
+        self._ignition_started: float | None = None
+
+    @staticmethod
+    def __ewma(average: float | None, value: float, elapsed: float, tau: float):
+        if average is None:
+            return value
+        return average + (1 - math.exp(-elapsed / tau)) * (value - average)
+
+    def update(self, timestamp: float, state: int, temperature: float) -> None:
+        """Fold a new reading into the aggregates."""
+        previous_state = self._state
+
+        if self._timestamp is not None and timestamp > self._timestamp:
+            elapsed = timestamp - self._timestamp
+            is_on = previous_state != STATE_OFF
+
+            self.time_in_state[previous_state] = (
+                self.time_in_state.get(previous_state, 0.0) + elapsed
+            )
+            if is_on:
+                self.on_time += elapsed
+
+            self.duty_cycle = self.__ewma(
+                self.duty_cycle,
+                100.0 if is_on else 0.0,
+                elapsed,
+                DUTY_CYCLE_TIME_CONSTANT,
+            )
+            self.heat_up_rate = self.__ewma(
+                self.heat_up_rate,
+                (temperature - self._temperature) * 3600 / elapsed,
+                elapsed,
+                HEAT_UP_RATE_TIME_CONSTANT,
+            )
+
+        if state != previous_state:
+            if state in IGNITION_STATES:
+                if self._ignition_started is None:
+                    self._ignition_started = timestamp
+            elif self._ignition_started is not None:
+                if state != STATE_OFF:
+                    self.last_ignition_duration = timestamp - self._ignition_started
+                self._ignition_started = None
+
+        self._timestamp = timestamp
+        self._state = state
+        self._temperature = temperature
@@ -11,7 +11,7 @@ from .const import (
     COMMAND_TURN_OFF,
     COMMAND_TURN_ON,
 )
-from .device import Device
+from .device import Device, write_command
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -136,6 +136,28 @@ class API:
 
         return await self.__send_command(token, command)
 
+    async def set_zone_temperature(
+        self, device: Device, token: dict[str, Any], zone: int, temperature: int
+    ) -> str:
+        """Send set temperature command to a thermostat zone of the device."""
+        _LOGGER.debug("Trying to set zone %s temperature to %s", zone, temperature)
+        command = device.zone_temperature_command(zone, temperature)
+        return await self.__send_command(token, command)
+
+    async def set_power_level(
+        self, device: Device, token: dict[str, Any], level: int
+    ) -> str:
+        """Send set power level command to the device."""
+        _LOGGER.debug("Trying to set power level to %s", level)
+        command = device.power_level_command(level)
+        return await self.__send_command(token, command)
+
+    async def write_records(self, token: dict[str, Any], records: list[str]) -> str:
+        """Send several record writes to the device in one call."""
+        _LOGGER.debug("Trying to write %s records", len(records))
+        command = write_command(records)
+        return await self.__send_command(token, command)
+
 
 class APIAuthError(Exception):
     """Exception class for auth error."""
@@ -0,0 +1,51 @@
+"""Retry backoff for 4Heat transports."""
+
+import random
+import time
+from typing import Any
+
+
+class DecorrelatedJitterBackoff:
+    """Decorrelated jitter exponential backoff of one transport.
+
+    After each consecutive failure the next delay is drawn between the base
+    and three times the previous delay, capped. Devices that failed together,
+    e.g. after a restart or a network outage, therefore retry at spread out
+    times instead of in bursts.
+    """
+
+    def __init__(self, base: float, cap: float) -> None:
+        """Initialise."""
+        self.base = base
+        self.cap = cap
+        self.failures = 0
+        self.delay = 0.0
+        self.retry_at = 0.0
+
+    @property
+    def ready(self) -> bool:
+        """Return if the transport may be tried again."""
+        return time.monotonic() >= self.retry_at
+
+    def failed(self) -> float:
+        """Record a failure and return the delay before the next attempt."""
+        self.failures += 1
+        self.delay = min(
+            self.cap, random.uniform(self.base, max(self.base, self.delay * 3))
+        )
+        self.retry_at = time.monotonic() + self.delay
+        return self.delay
+
+    def succeeded(self) -> None:
+        """Record a success, which resets the backoff."""
+        self.failures = 0
+        self.delay = 0.0
+        self.retry_at = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Serialize."""
+        return {
+            "failures": self.failures,
+            "delay": round(self.delay, 1),
+            "retry_in": round(max(0.0, self.retry_at - time.monotonic()), 1),
+        }
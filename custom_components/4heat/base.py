@@ -12,7 +12,6 @@ and what additional properties and methods you need to add for each entity type.
 
 import logging
 
-from homeassistant.core import callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
@@ -50,17 +49,8 @@ class FourHeatBaseEntity(CoordinatorEntity):
     ) -> None:
         """Initialise entity."""
         super().__init__(coordinator)
-        self.data = self.coordinator.device.to_dict()
         self.parameter = parameter
 
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        """Update sensor with latest data from coordinator."""
-        # This method is called by your DataUpdateCoordinator when a successful update runs.
-        self.data = self.coordinator.device.to_dict()
-        _LOGGER.debug("Updating device: %s", self.data)
-        self.async_write_ha_state()
-
     @property
     def device_info(self) -> DeviceInfo:
         """Return device information."""
@@ -0,0 +1,118 @@
+"""Compact binary capture of raw 4Heat frames.
+
+A capture file starts with a small header followed by length-prefixed records:
+
+    header: magic (4s) | version (H)
+    record: timestamp (d) | transport (B) | length (I) | payload (length bytes)
+
+All integers are little endian. Local payloads are the raw TCP reply, cloud
+payloads are the compact JSON of the Details response. Files are rotated when
+they reach the configured size.
+"""
+
+from collections.abc import Iterator
+import mmap
+import os
+import struct
+import time
+
+CAPTURE_MAGIC = b"4HFR"
+CAPTURE_VERSION = 1
+
+TRANSPORT_LOCAL = 0
+TRANSPORT_CLOUD = 1
+
+_HEADER = struct.Struct("<4sH")
+_RECORD = struct.Struct("<dBI")
+
+
+class FrameRecorder:
+    """Append raw frames to a rotating capture file.
+
+    All methods do blocking file I/O and must run in an executor.
+    """
+
+    def __init__(self, path: str, max_bytes: int, backups: int) -> None:
+        """Initialise."""
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._file = None
+        self._size = 0
+
+    def __open(self) -> None:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._file = open(self.path, "ab")  # noqa: SIM115
+        self._size = self._file.tell()
+        if self._size == 0:
+            self._size = self._file.write(_HEADER.pack(CAPTURE_MAGIC, CAPTURE_VERSION))
+
+    def __rotate(self) -> None:
+        self.close()
+        for index in range(self.backups - 1, 0, -1):
+            source = f"{self.path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+    def append(
+        self, transport: int, payload: bytes, timestamp: float | None = None
+    ) -> None:
+        """Append a single frame."""
+        if self._file is None:
+            self.__open()
+
+        size = _RECORD.size + len(payload)
+        if self._size + size > self.max_bytes and self._size > _HEADER.size:
+            self.__rotate()
+            self.__open()
+
+        self._file.write(
+            _RECORD.pack(
+                time.time() if timestamp is None else timestamp,
+                transport,
+                len(payload),
+            )
+        )
+        self._file.write(payload)
+        self._file.flush()
+        self._size += size
+
+    def close(self) -> None:
+        """Close the capture file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def iter_frames(path: str) -> Iterator[tuple[float, int, bytes]]:
+    """Iterate over the frames of a capture file.
+
+    The file is memory mapped, so only the records being read are paged in.
+    """
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return
+
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            magic, version = _HEADER.unpack_from(buffer, 0)
+            if magic != CAPTURE_MAGIC or version != CAPTURE_VERSION:
+                raise CaptureFormatError(f"{path} is not a 4Heat capture file")
+
+            offset = _HEADER.size
+            end = len(buffer)
+            while offset + _RECORD.size <= end:
+                timestamp, transport, length = _RECORD.unpack_from(buffer, offset)
+                offset += _RECORD.size
+                if offset + length > end:
+                    # Truncated last record, e.g. the file is still being written
+                    break
+                yield timestamp, transport, buffer[offset : offset + length]
+                offset += length
+
+
+class CaptureFormatError(Exception):
+    """Exception class for invalid capture files."""
@@ -10,6 +10,7 @@ from homeassistant.components.climate import (
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import ATTR_TEMPERATURE, UnitOfTemperature
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .base import FourHeatBaseEntity
@@ -31,6 +32,10 @@ async def async_setup_entry(
     ].coordinator
 
     climates = [FourHeatClimate(coordinator, "lareira")]
+    # Secondary thermostat zones found in the frames of the device
+    climates.extend(
+        FourHeatZoneClimate(coordinator, zone) for zone in coordinator.device.zones
+    )
 
     # Now create the climates.
     async_add_entities(climates)
@@ -123,13 +128,109 @@ class FourHeatClimate(FourHeatBaseEntity, ClimateEntity):
     @property
     def extra_state_attributes(self):
         """Return the extra state attributes."""
-        # Add any additional attributes you want on your sensor.
-        attrs = {}
-        attrs["is_connected"] = self.coordinator.device.is_connected
-        attrs["state_code"] = self.coordinator.device.state
-        attrs["state_desc"] = self.coordinator.device.state_description
-        attrs["state_timestamp"] = self.coordinator.device.state_timestamp.isoformat()
-        attrs["last_update"] = self.coordinator.device.last_update.isoformat()
-        attrs["error_code"] = self.coordinator.device.error_code
-        attrs["error"] = self.coordinator.device.error_description
-        return attrs
+        # Built once per update and shared by all entities of the device
+        return self.coordinator.attributes
+
+
+class FourHeatZoneClimate(FourHeatClimate):
+    """Secondary thermostat zone of a 4Heat device.
+
+    The stove is shared by all zones, so a zone only heats: it is turned on
+    and off with the main climate of the stove. Temperatures are scaled by the
+    decimals of the record.
+    """
+
+    _attr_hvac_modes = [HVACMode.HEAT]
+
+    def __init__(self, coordinator: FourHeatDataUpdateCoordinator, zone: int) -> None:
+        """Initialise entity."""
+        super().__init__(coordinator, f"zone_{zone}")
+        self.zone = zone
+
+    @property
+    def _zone(self) -> dict:
+        return self.coordinator.device.zones.get(self.zone, {})
+
+    def __scale(self, key: str) -> float | None:
+        zone = self._zone
+        if key not in zone:
+            return None
+        return zone[key] / 10 ** zone["pos_punto"]
+
+    @property
+    def available(self) -> bool:
+        """Return if the zone is in the last frame of the device."""
+        return super().available and self.zone in self.coordinator.device.zones
+
+    @property
+    def hvac_mode(self):
+        """Return current HVAC Mode, always HEAT."""
+        return HVACMode.HEAT
+
+    @property
+    def supported_features(self):
+        """Return the list of supported features."""
+        if self._zone.get("enablement"):
+            return ClimateEntityFeature.TARGET_TEMPERATURE
+        return ClimateEntityFeature(0)
+
+    @property
+    def current_temperature(self):
+        """Return the current temperature."""
+        return self.__scale("temperature")
+
+    @property
+    def target_temperature(self):
+        """Return the target temperature."""
+        return self.__scale("value")
+
+    @property
+    def min_temp(self) -> float:
+        """Return the minimum temperature of the zone."""
+        return self.__scale("min") or super().min_temp
+
+    @property
+    def max_temp(self) -> float:
+        """Return the maximum temperature of the zone."""
+        return self.__scale("max") or super().max_temp
+
+    @property
+    def target_temperature_step(self) -> float:
+        """Return the smallest setpoint change of the zone."""
+        return 1 / 10 ** self._zone.get("pos_punto", 0)
+
+    async def async_set_temperature(self, **kwargs):
+        """Set target temperature."""
+        if kwargs.get(ATTR_TEMPERATURE) is not None:
+            value = round(
+                kwargs[ATTR_TEMPERATURE] * 10 ** self._zone.get("pos_punto", 0)
+            )
+
+            resp = await self.coordinator.async_set_zone_temperature(self.zone, value)
+            _LOGGER.debug("Response to set zone temperature command: %s", str(resp))
+            await self.coordinator.async_refresh()
+        else:
+            _LOGGER.error("No temperature provided to set_temperature")
+
+    async def async_set_hvac_mode(self, hvac_mode):
+        """Reject other modes than HEAT, the stove is shared by all zones."""
+        if hvac_mode != HVACMode.HEAT:
+            self.__reject()
+
+    async def async_toggle(self):
+        """Reject toggling the zone."""
+        self.__reject()
+
+    async def async_turn_on(self):
+        """Reject turning the zone on."""
+        self.__reject()
+
+    async def async_turn_off(self):
+        """Reject turning the zone off."""
+        self.__reject()
+
+    def __reject(self) -> None:
+        raise ServiceValidationError(
+            f"Zone {self.zone} can not be turned on or off, "
+            "turn the stove on or off with its main climate"
+        )
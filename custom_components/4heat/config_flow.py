@@ -9,18 +9,52 @@ Using your api data in your flow
 
 from __future__ import annotations
 
+import json
 import logging
+from pathlib import Path
 from typing import Any
 
 import voluptuous as vol
 
-from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
-from homeassistant.const import CONF_CODE, CONF_PASSWORD, CONF_PIN, CONF_USERNAME
-from homeassistant.core import HomeAssistant
+from homeassistant.components.network import async_get_source_ip
+from homeassistant.config_entries import (
+    ConfigEntry,
+    ConfigFlow,
+    ConfigFlowResult,
+    OptionsFlow,
+)
+from homeassistant.const import (
+    CONF_CODE,
+    CONF_IP_ADDRESS,
+    CONF_PASSWORD,
+    CONF_PIN,
+    CONF_USERNAME,
+)
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
 
+from .address import AddressCache
 from .api import API, APIAuthError
-from .const import DOMAIN
+from .const import (
+    ADDRESS_TTL,
+    BUNDLED_FILE_MAP,
+    CONF_COMMAND_EXPIRY,
+    CONF_DISCOVERY_NETWORK,
+    CONF_LOCAL_ONLY,
+    CONF_MIN_WRITE_INTERVAL,
+    CONF_RECORD_FRAMES,
+    CONF_ROOM_TEMPERATURE_DEADBAND,
+    CONF_STALE_WINDOW,
+    CONF_TARGET_TEMPERATURE_DEADBAND,
+    DEFAULT_COMMAND_EXPIRY,
+    DEFAULT_MIN_WRITE_INTERVAL,
+    DEFAULT_RECORD_FRAMES,
+    DEFAULT_ROOM_TEMPERATURE_DEADBAND,
+    DEFAULT_STALE_WINDOW,
+    DEFAULT_TARGET_TEMPERATURE_DEADBAND,
+    DOMAIN,
+)
+from .discovery import async_get_discovery, default_network, parse_network
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -89,6 +123,12 @@ class FourHeatConfigFlow(ConfigFlow, domain=DOMAIN):
     _input_data: dict[str, Any]
     _title: str
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlow:
+        """Get the options flow for this handler."""
+        return FourHeatOptionsFlow()
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
@@ -99,6 +139,13 @@ class FourHeatConfigFlow(ConfigFlow, domain=DOMAIN):
 
         _LOGGER.info("Async_step_user")
 
+        return self.async_show_menu(step_id="user", menu_options=["cloud", "local"])
+
+    async def async_step_cloud(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Set up a device with the 4Heat cloud account."""
+
         errors: dict[str, str] = {}
 
         if user_input is not None:
@@ -126,9 +173,55 @@ class FourHeatConfigFlow(ConfigFlow, domain=DOMAIN):
 
         # Show initial form.
         return self.async_show_form(
-            step_id="user", data_schema=STEP_USER_DATA_SCHEMA, errors=errors
+            step_id="cloud", data_schema=STEP_USER_DATA_SCHEMA, errors=errors
         )
 
+    async def async_step_local(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Set up a device on the local network, without the cloud."""
+        errors: dict[str, str] = {}
+
+        if user_input is not None:
+            await self.async_set_unique_id(user_input[CONF_CODE])
+            self._abort_if_unique_id_configured()
+            if await async_get_discovery(self.hass).probe(user_input[CONF_IP_ADDRESS]):
+                file_map = await self.hass.async_add_executor_job(
+                    _load_bundled_file_map
+                )
+                return self.async_create_entry(
+                    title=f"4Heat {user_input[CONF_CODE]}",
+                    data=user_input,
+                    options={**file_map, CONF_LOCAL_ONLY: True},
+                )
+            errors["base"] = "cannot_connect"
+            suggested_ip = user_input[CONF_IP_ADDRESS]
+        else:
+            suggested_ip = await self.__async_discover_address()
+
+        return self.async_show_form(
+            step_id="local",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_CODE, description={"suggested_value": ""}): str,
+                    vol.Required(
+                        CONF_IP_ADDRESS, description={"suggested_value": suggested_ip}
+                    ): str,
+                }
+            ),
+            errors=errors,
+        )
+
+    async def __async_discover_address(self) -> str | None:
+        """Return the first device found on the network of Home Assistant."""
+        try:
+            network = default_network(await async_get_source_ip(self.hass))
+            found = await async_get_discovery(self.hass).async_discover(network)
+        except (HomeAssistantError, ValueError) as err:
+            _LOGGER.debug("LAN discovery of 4Heat devices failed: %s", err)
+            return None
+        return found[0] if found else None
+
     async def async_step_reconfigure(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
@@ -147,6 +240,10 @@ class FourHeatConfigFlow(ConfigFlow, domain=DOMAIN):
             self.context["entry_id"]
         )
 
+        if CONF_PIN not in config_entry.data:
+            # Set up without the cloud, only the address can change
+            return await self.async_step_reconfigure_local(user_input)
+
         if user_input is not None:
             try:
                 user_input[CONF_CODE] = config_entry.data[CONF_CODE]
@@ -165,7 +262,7 @@ class FourHeatConfigFlow(ConfigFlow, domain=DOMAIN):
                     config_entry,
                     unique_id=config_entry.unique_id,
                     data={**config_entry.data, **user_input},
-                    options=file_map,
+                    options={**config_entry.options, **file_map},
                     reason="reconfigure_successful",
                 )
         return self.async_show_form(
@@ -182,6 +279,126 @@ class FourHeatConfigFlow(ConfigFlow, domain=DOMAIN):
             errors=errors,
         )
 
+    async def async_step_reconfigure_local(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Change the address of a device set up without the cloud."""
+        errors: dict[str, str] = {}
+        config_entry = self.hass.config_entries.async_get_entry(
+            self.context["entry_id"]
+        )
+
+        if user_input is not None:
+            if await async_get_discovery(self.hass).probe(user_input[CONF_IP_ADDRESS]):
+                # The cached address must not outlive the one entered here
+                await AddressCache(
+                    self.hass, config_entry.data[CONF_CODE], ADDRESS_TTL
+                ).async_replace(user_input[CONF_IP_ADDRESS])
+                return self.async_update_reload_and_abort(
+                    config_entry,
+                    data={**config_entry.data, **user_input},
+                    reason="reconfigure_successful",
+                )
+            errors["base"] = "cannot_connect"
+
+        return self.async_show_form(
+            step_id="reconfigure_local",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_IP_ADDRESS, default=config_entry.data[CONF_IP_ADDRESS]
+                    ): str,
+                }
+            ),
+            errors=errors,
+        )
+
+
+def _load_bundled_file_map() -> dict[str, Any]:
+    """Load the file map shipped with the integration."""
+    with open(Path(__file__).parent / BUNDLED_FILE_MAP, encoding="utf-8") as file:
+        return json.load(file)
+
+
+class FourHeatOptionsFlow(OptionsFlow):
+    """Handle the integration options.
+
+    The options of the config entry also hold the device file map, so the
+    settings entered here are merged into them instead of replacing them.
+    """
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage the options."""
+        errors: dict[str, str] = {}
+
+        if user_input is not None:
+            network = user_input.get(CONF_DISCOVERY_NETWORK)
+            if network:
+                try:
+                    parse_network(network)
+                except ValueError:
+                    errors[CONF_DISCOVERY_NETWORK] = "invalid_network"
+
+            if not errors:
+                data = {**self.config_entry.options, **user_input}
+                if not network:
+                    # A cleared optional field is missing from the input
+                    data.pop(CONF_DISCOVERY_NETWORK, None)
+                return self.async_create_entry(data=data)
+
+        options = self.config_entry.options
+        schema = {
+            vol.Required(
+                CONF_ROOM_TEMPERATURE_DEADBAND,
+                default=options.get(
+                    CONF_ROOM_TEMPERATURE_DEADBAND,
+                    DEFAULT_ROOM_TEMPERATURE_DEADBAND,
+                ),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+            vol.Required(
+                CONF_TARGET_TEMPERATURE_DEADBAND,
+                default=options.get(
+                    CONF_TARGET_TEMPERATURE_DEADBAND,
+                    DEFAULT_TARGET_TEMPERATURE_DEADBAND,
+                ),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+            vol.Required(
+                CONF_MIN_WRITE_INTERVAL,
+                default=options.get(
+                    CONF_MIN_WRITE_INTERVAL, DEFAULT_MIN_WRITE_INTERVAL
+                ),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+            vol.Required(
+                CONF_STALE_WINDOW,
+                default=options.get(CONF_STALE_WINDOW, DEFAULT_STALE_WINDOW),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+            vol.Required(
+                CONF_COMMAND_EXPIRY,
+                default=options.get(CONF_COMMAND_EXPIRY, DEFAULT_COMMAND_EXPIRY),
+            ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+            vol.Required(
+                CONF_RECORD_FRAMES,
+                default=options.get(CONF_RECORD_FRAMES, DEFAULT_RECORD_FRAMES),
+            ): bool,
+            vol.Optional(
+                CONF_DISCOVERY_NETWORK,
+                description={"suggested_value": options.get(CONF_DISCOVERY_NETWORK)},
+            ): str,
+        }
+        if CONF_PIN in self.config_entry.data:
+            # Entries with an account can stop using it, with the cached file map
+            schema[
+                vol.Required(
+                    CONF_LOCAL_ONLY, default=options.get(CONF_LOCAL_ONLY, False)
+                )
+            ] = bool
+
+        return self.async_show_form(
+            step_id="init", data_schema=vol.Schema(schema), errors=errors
+        )
+
 
 class CannotConnect(HomeAssistantError):
     """Error to indicate we cannot connect."""
@@ -4,6 +4,8 @@ DOMAIN = "4heat"
 
 RENAME_DEVICE_SERVICE_NAME = "rename_device_service"
 RESPONSE_SERVICE_NAME = "response_service"
+HISTORY_SERVICE_NAME = "get_history_statistics"
+SET_PARAMETERS_SERVICE_NAME = "set_parameters"
 
 API_BASE_URL = "https://wifi4heat.azurewebsites.net/"
 
@@ -13,9 +15,86 @@ COMMAND_READ_DATA = '["2WL","0"]'
 COMMAND_TURN_ON = '["2WC","1","05040000"]'
 COMMAND_TURN_OFF = '["2WC","1","05050000"]'
 COMMAND_SET_TEMPERATURE = '["2WC","1","0512005a'
+# Code of a record write, followed by the record with its new value
+WRITE_RECORD_CODE = "05"
 
 UPDATE_INTERVAL = 30
 
+# Deadline budgets, in seconds. An update or command must finish within its
+# deadline, the TCP attempt and cloud login get at most their share of it and
+# the cloud request gets what is left.
+UPDATE_DEADLINE = 25
+COMMAND_DEADLINE = 25
+TCP_TIMEOUT = 10
+AUTH_TIMEOUT = 8
+
+# Reconnect backoff, in seconds. The poll after the first update is delayed by a
+# random offset of up to STARTUP_JITTER, and a failing transport is retried after a delay that
+# grows from UPDATE_INTERVAL up to its cap.
+STARTUP_JITTER = 10
+TCP_BACKOFF_CAP = 300
+CLOUD_BACKOFF_CAP = 600
+
+# Local only entries poll the device over TCP and never call the cloud. Their
+# file map is the one bundled with the integration (file_map.json), or the one
+# cached from the cloud when a cloud entry is switched to local only.
+CONF_LOCAL_ONLY = "local_only"
+BUNDLED_FILE_MAP = "file_map.json"
+
+# The device address is resolved again when older than ADDRESS_TTL seconds or
+# after ADDRESS_RESOLVE_FAILURES consecutive TCP failures
+ADDRESS_TTL = 24 * 3600
+ADDRESS_RESOLVE_FAILURES = 3
+
+# LAN discovery probes the hosts of a network, by default the /24 of the last
+# known device address, and caches the devices found for DISCOVERY_CACHE_TTL
+CONF_DISCOVERY_NETWORK = "discovery_network"
+DISCOVERY_CONCURRENCY = 64
+DISCOVERY_TIMEOUT = 1.5
+DISCOVERY_CACHE_TTL = 300
+DISCOVERY_MAX_HOSTS = 1024
+
+# Refresh intervals, in seconds, of the data that changes slowly. State, error
+# and temperatures are refreshed on every poll.
+PARAMETERS_INTERVAL = 5 * 60
+IDENTITY_INTERVAL = 3600
+
+# Seconds after an update during which refresh requests return the cached data
+REFRESH_FRESHNESS = 5
+
+DIAGNOSTICS_FRAME_BUFFER_SIZE = 50
+
+CONF_RECORD_FRAMES = "record_frames"
+DEFAULT_RECORD_FRAMES = False
+CAPTURE_MAX_BYTES = 16 * 1024 * 1024
+CAPTURE_BACKUPS = 10
+
+CONF_ROOM_TEMPERATURE_DEADBAND = "room_temperature_deadband"
+CONF_TARGET_TEMPERATURE_DEADBAND = "target_temperature_deadband"
+CONF_MIN_WRITE_INTERVAL = "min_write_interval"
+DEFAULT_ROOM_TEMPERATURE_DEADBAND = 0.5
+DEFAULT_TARGET_TEMPERATURE_DEADBAND = 0.0
+DEFAULT_MIN_WRITE_INTERVAL = 0
+
+# Seconds the last good data is served after updates start failing
+CONF_STALE_WINDOW = "stale_window"
+DEFAULT_STALE_WINDOW = 300
+
+# Minutes a command that could not be delivered is kept for replay
+CONF_COMMAND_EXPIRY = "command_expiry"
+DEFAULT_COMMAND_EXPIRY = 30
+
+# 24 hours of readings at the default update interval
+HISTORY_SIZE = 2880
+
+# State codes reported by the stove (see lingue_stati in the file map)
+STATE_OFF = 0
+IGNITION_STATES = frozenset({1, 2, 3, 4, 10})
+
+# Time constants, in seconds, of the exponentially weighted statistics
+DUTY_CYCLE_TIME_CONSTANT = 24 * 3600
+HEAT_UP_RATE_TIME_CONSTANT = 600
+
 DEVICE_ERRORS = {
     "0": "Sistema OK",
     "1": "Segurança de alta tensão 1",
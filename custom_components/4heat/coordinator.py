@@ -1,18 +1,83 @@
 """DataUpdateCoordinator for 4Heat integration."""
 
 import asyncio
+from collections.abc import Mapping
+from contextlib import suppress
 from datetime import datetime, timedelta
+import json
 import logging
+import random
+import time
+from types import MappingProxyType
+from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_CODE, CONF_PASSWORD, CONF_PIN, CONF_USERNAME
-from homeassistant.core import DOMAIN as HOMEASSISTANT_DOMAIN, HomeAssistant
+from homeassistant.const import (
+    CONF_CODE,
+    CONF_IP_ADDRESS,
+    CONF_PASSWORD,
+    CONF_PIN,
+    CONF_USERNAME,
+)
+from homeassistant.core import DOMAIN as HOMEASSISTANT_DOMAIN, HomeAssistant, callback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
+from .address import AddressCache
+from .aggregates import StreamingStatistics
 from .api import API, APIAuthError, APIConnectionError
-from .const import UPDATE_INTERVAL
-from .device import Device, device_loader
+from .backoff import DecorrelatedJitterBackoff
+from .capture import TRANSPORT_CLOUD, TRANSPORT_LOCAL, FrameRecorder
+from .const import (
+    ADDRESS_RESOLVE_FAILURES,
+    ADDRESS_TTL,
+    AUTH_TIMEOUT,
+    CAPTURE_BACKUPS,
+    CAPTURE_MAX_BYTES,
+    CLOUD_BACKOFF_CAP,
+    COMMAND_DEADLINE,
+    CONF_COMMAND_EXPIRY,
+    CONF_DISCOVERY_NETWORK,
+    CONF_LOCAL_ONLY,
+    CONF_MIN_WRITE_INTERVAL,
+    CONF_RECORD_FRAMES,
+    CONF_ROOM_TEMPERATURE_DEADBAND,
+    CONF_STALE_WINDOW,
+    CONF_TARGET_TEMPERATURE_DEADBAND,
+    DEFAULT_COMMAND_EXPIRY,
+    DEFAULT_MIN_WRITE_INTERVAL,
+    DEFAULT_RECORD_FRAMES,
+    DEFAULT_ROOM_TEMPERATURE_DEADBAND,
+    DEFAULT_STALE_WINDOW,
+    DEFAULT_TARGET_TEMPERATURE_DEADBAND,
+    DIAGNOSTICS_FRAME_BUFFER_SIZE,
+    DOMAIN,
+    HISTORY_SIZE,
+    IDENTITY_INTERVAL,
+    PARAMETERS_INTERVAL,
+    REFRESH_FRESHNESS,
+    STARTUP_JITTER,
+    TCP_BACKOFF_CAP,
+    TCP_TIMEOUT,
+    UPDATE_DEADLINE,
+    UPDATE_INTERVAL,
+)
+from .deadline import Deadline
+from .device import Device, DeviceDataLoadError, _DeviceLoader
+from .discovery import async_get_discovery, default_network
+from .frame import record_signature
+from .history import DeviceHistory
+from .journal import (
+    COMMAND_PARAMETERS,
+    COMMAND_POWER,
+    COMMAND_POWER_LEVEL,
+    COMMAND_TEMPERATURE,
+    COMMAND_ZONE_TEMPERATURE,
+    CommandJournal,
+    zone_command,
+)
+from .ring import DECODED_FIELDS, FrameRingBuffer
 from .tcp import TCPCommunication, TCPCommunicationError
+from .tiers import ALL_TIERS, TIER_IDENTITY, TIER_PARAMETERS, RefreshTiers
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -27,13 +92,65 @@ class FourHeatDataUpdateCoordinator(DataUpdateCoordinator):
 
         # Set variables from values entered in config flow setup
         self.code = config_entry.data[CONF_CODE]
-        self.pin = config_entry.data[CONF_PIN]
-        self.user = config_entry.data[CONF_USERNAME]
-        self.pwd = config_entry.data[CONF_PASSWORD]
+        self.pin = config_entry.data.get(CONF_PIN)
+        self.user = config_entry.data.get(CONF_USERNAME)
+        self.pwd = config_entry.data.get(CONF_PASSWORD)
         self.file_map = config_entry.options
+        # In local only mode the cloud is never called
+        self.local_only = config_entry.options.get(CONF_LOCAL_ONLY, False)
+        self.deadbands = {
+            "room_temperature": config_entry.options.get(
+                CONF_ROOM_TEMPERATURE_DEADBAND, DEFAULT_ROOM_TEMPERATURE_DEADBAND
+            ),
+            "target_temperature": config_entry.options.get(
+                CONF_TARGET_TEMPERATURE_DEADBAND, DEFAULT_TARGET_TEMPERATURE_DEADBAND
+            ),
+        }
+        self.min_write_interval = config_entry.options.get(
+            CONF_MIN_WRITE_INTERVAL, DEFAULT_MIN_WRITE_INTERVAL
+        )
         self.token = None
         self.tcp_client = None
         self.com_type = "TCP"
+        self.frames = FrameRingBuffer(DIAGNOSTICS_FRAME_BUFFER_SIZE)
+        self.recorder = None
+        self.history = DeviceHistory(HISTORY_SIZE)
+        self.statistics = StreamingStatistics()
+        self.journal = CommandJournal(
+            hass,
+            self.code,
+            config_entry.options.get(CONF_COMMAND_EXPIRY, DEFAULT_COMMAND_EXPIRY) * 60,
+        )
+        self._replay_task: asyncio.Task | None = None
+        self._refresh_task: asyncio.Task | None = None
+        self._refreshed_at: float | None = None
+        self._updated_at: float | None = None
+        self.attributes: Mapping[str, Any] = MappingProxyType({})
+        self.stale_window = config_entry.options.get(
+            CONF_STALE_WINDOW, DEFAULT_STALE_WINDOW
+        )
+        self.backoff = {
+            "tcp": DecorrelatedJitterBackoff(UPDATE_INTERVAL, TCP_BACKOFF_CAP),
+            "cloud": DecorrelatedJitterBackoff(UPDATE_INTERVAL, CLOUD_BACKOFF_CAP),
+        }
+        self.start_offset = random.uniform(0, STARTUP_JITTER)
+        self.address = AddressCache(hass, self.code, ADDRESS_TTL)
+        self.discovery = async_get_discovery(hass)
+        self.discovery_network = config_entry.options.get(CONF_DISCOVERY_NETWORK)
+        # Records of the last frame read over TCP, to recognise the device
+        self._signature: tuple[bytes, ...] | None = None
+        intervals = {TIER_PARAMETERS: PARAMETERS_INTERVAL}
+        if not self.local_only:
+            # The identity of a device is only known to the cloud
+            intervals[TIER_IDENTITY] = IDENTITY_INTERVAL
+        self.tiers = RefreshTiers(intervals)
+
+        if config_entry.options.get(CONF_RECORD_FRAMES, DEFAULT_RECORD_FRAMES):
+            self.recorder = FrameRecorder(
+                hass.config.path(DOMAIN, f"frames_{self.code}.bin"),
+                CAPTURE_MAX_BYTES,
+                CAPTURE_BACKUPS,
+            )
 
         # Initialise DataUpdateCoordinator
         super().__init__(
@@ -45,23 +162,120 @@ class FourHeatDataUpdateCoordinator(DataUpdateCoordinator):
             # Polling interval. Will only be polled if you have made your
             # platform entities, CoordinatorEntities.
             # Using config option here but you can just use a fixed value.
-            update_interval=timedelta(seconds=UPDATE_INTERVAL),
+            # The first update runs at once, the poll after it is offset at
+            # random, so devices set up together, e.g. after a restart, do
+            # not poll in lockstep.
+            update_interval=timedelta(seconds=UPDATE_INTERVAL + self.start_offset),
         )
 
         # Initialise your api here and make available to your integration.
-        self.api = API(code=self.code, pin=self.pin, user=self.user, pwd=self.pwd)
+        self.api = None
+        if not self.local_only:
+            self.api = API(code=self.code, pin=self.pin, user=self.user, pwd=self.pwd)
+
+        # Each device gets its own loader, as the file maps of devices differ
+        self.loader = _DeviceLoader()
+        self.loader.initiate(self.file_map)
+        self.device = Device(self.loader)
+        self.device.ip = config_entry.data.get(CONF_IP_ADDRESS)
+
+    def __claimed_addresses(self) -> set[str]:
+        """Return the addresses of the other devices set up."""
+        return {
+            runtime_data.coordinator.device.ip
+            for runtime_data in self.hass.data.get(DOMAIN, {}).values()
+            if runtime_data.coordinator is not self
+            and runtime_data.coordinator.device.ip
+        }
+
+    async def __is_device(self, ip: str) -> bool:
+        """Return if the device at the address sends the records of this one."""
+        if self._signature is None:
+            # Never read, only the addresses of the other devices are known
+            return True
+        try:
+            frame = await TCPCommunication(ip, self.device.port).read_data()
+            return record_signature(frame) == self._signature
+        except (TCPCommunicationError, ValueError):
+            return False
 
-        device_loader.initiate(self.file_map)
-        self.device = Device()
+    async def __discover_address(self, deadline: Deadline) -> str | None:
+        """Find the device on the local network, without the cloud.
 
-    async def __initiate_tcp(self):
+        A device found at an address of another device set up, or sending
+        other records than the ones last read, is not this one.
+        """
+        known = self.address.ip or self.device.ip
+        network = self.discovery_network or (known and default_network(known))
+        if not network:
+            return None
+        try:
+            async with deadline.timeout(TCP_TIMEOUT):
+                claimed = self.__claimed_addresses()
+                if (
+                    known
+                    and known not in claimed
+                    and await self.discovery.probe(known)
+                    and await self.__is_device(known)
+                ):
+                    return known
+                found = [
+                    ip
+                    for ip in await self.discovery.async_discover(network)
+                    if ip not in claimed
+                ]
+                # With several devices on the network only the cloud knows
+                # which one
+                if len(found) == 1 and await self.__is_device(found[0]):
+                    return found[0]
+        except (TimeoutError, ValueError) as err:
+            _LOGGER.warning("LAN discovery of 4Heat device failed: %r", err)
+        return None
+
+    async def __resolve_address(self, deadline: Deadline):
+        known = self.address.ip or self.device.ip
+        if ip := await self.__discover_address(deadline):
+            self.device.ip = ip
+            self.address.set(ip)
+            return
+        if self.api is None:
+            if known is None:
+                raise APIConnectionError("4Heat device not found on the network")
+            # Keep trying the last known address
+            self.device.ip = known
+            return
+        try:
+            await self.__update_from_cloud("resolve_ip", deadline)
+        except (APIAuthError, APIConnectionError, TimeoutError) as err:
+            if known is None:
+                raise
+            _LOGGER.warning("Using cached address %s of 4Heat device: %s", known, err)
+        if self.device.ip:
+            self.address.set(self.device.ip)
+        elif known:
+            self.device.ip = known
+        else:
+            raise APIConnectionError("Not possible to get device IP Address")
+
+    async def __initiate_tcp(self, deadline: Deadline):
         # Initialise TCP Client
         if self.tcp_client is None:
-            if self.device.ip is None:
-                await self.__update_from_cloud()
-                if self.device.ip is None:
-                    raise APIConnectionError("Not possible to get device IP Address")
+            if self.device.ip is None or self.address.expired:
+                await self.__resolve_address(deadline)
+            self.tcp_client = TCPCommunication(self.device.ip, self.device.port)
+
+    def __follow_address(self):
+        """Rebuild the TCP client when the cloud reports a new address."""
+        if not self.device.ip:
+            return
+        if self.tcp_client is not None and self.device.ip != self.tcp_client.ip:
+            _LOGGER.info(
+                "4Heat device moved from %s to %s", self.tcp_client.ip, self.device.ip
+            )
             self.tcp_client = TCPCommunication(self.device.ip, self.device.port)
+            # The new address deserves an attempt on the next poll
+            self.backoff["tcp"].succeeded()
+        self.address.set(self.device.ip)
 
     async def async_auth(self):
         """Authenticate with the API."""
@@ -78,125 +292,422 @@ class FourHeatDataUpdateCoordinator(DataUpdateCoordinator):
             if self.token is None or not self.token.get("access_token"):
                 raise APIAuthError("Authentication failed")
 
-    async def __update_from_cloud(self):
-        await self.async_auth()
-        resp = await self.api.get_data(self.token)
-        device_loader.load_from_cloud(self.device, resp)
+    def __decoded(self) -> tuple:
+        return tuple(getattr(self.device, field) for field in DECODED_FIELDS)
 
-    async def __update_from_local(self):
-        resp = await self.tcp_client.read_data()
-        device_loader.load_from_local(self.device, resp)
+    async def __capture(self, transport: int, payload: bytes) -> None:
+        try:
+            await self.hass.async_add_executor_job(
+                self.recorder.append, transport, payload
+            )
+        except OSError as e:
+            _LOGGER.error("Error writing frame capture: %s", e)
+
+    async def __update_from_cloud(
+        self, decision: str, deadline: Deadline, tiers: frozenset[str] = ALL_TIERS
+    ):
+        if self.api is None:
+            raise APIConnectionError("Device unreachable, cloud disabled in local mode")
+        backoff = self.backoff["cloud"]
+        if not backoff.ready:
+            raise APIConnectionError(
+                f"Cloud unavailable, next attempt in {backoff.as_dict()['retry_in']}s"
+            )
+        try:
+            await self.__read_cloud(decision, deadline, tiers)
+        except (APIAuthError, APIConnectionError, TimeoutError):
+            backoff.failed()
+            raise
+        backoff.succeeded()
+
+    async def __read_cloud(
+        self, decision: str, deadline: Deadline, tiers: frozenset[str]
+    ):
+        async with deadline.timeout(AUTH_TIMEOUT):
+            await self.async_auth()
+        resp = None
+        started = time.monotonic()
+        try:
+            async with deadline.timeout():
+                resp = await self.api.get_data(self.token)
+            if self.recorder:
+                await self.__capture(
+                    TRANSPORT_CLOUD, json.dumps(resp, separators=(",", ":")).encode()
+                )
+            self.loader.load_from_cloud(self.device, resp, tiers)
+        except (Exception, asyncio.CancelledError) as err:
+            self.frames.record(
+                "cloud", decision, resp, None, time.monotonic() - started, err
+            )
+            raise
+        self.frames.record(
+            "cloud", decision, resp, self.__decoded(), time.monotonic() - started
+        )
+
+    async def __refresh_identity(self, deadline: Deadline) -> bool:
+        """Read the name and firmware of a device polled over TCP."""
+        if self.api is None or not self.backoff["cloud"].ready:
+            return False
+        try:
+            await self.__update_from_cloud(
+                "identity", deadline, frozenset({TIER_IDENTITY})
+            )
+        except (
+            APIAuthError,
+            APIConnectionError,
+            DeviceDataLoadError,
+            TimeoutError,
+        ) as err:
+            _LOGGER.debug("Identity of 4Heat device not refreshed: %r", err)
+            return False
+        return True
+
+    async def __update_from_local(self, tiers: frozenset[str]):
+        resp = None
+        started = time.monotonic()
+        try:
+            resp = await self.tcp_client.read_data()
+            if self.recorder and resp:
+                await self.__capture(TRANSPORT_LOCAL, resp)
+            self.loader.load_from_local(self.device, resp, tiers)
+            if self._signature is None:
+                self._signature = record_signature(resp)
+        except (Exception, asyncio.CancelledError) as err:
+            self.frames.record(
+                "tcp", "poll", resp, None, time.monotonic() - started, err
+            )
+            raise
+        self.frames.record(
+            "tcp", "poll", resp, self.__decoded(), time.monotonic() - started
+        )
+
+    async def _async_setup(self) -> None:
+        """Load the commands queued and the address found before a restart."""
+        await self.journal.async_load()
+        # The cached address is the one the device was last found at, the
+        # configured one may be outdated. Addresses entered by the user
+        # replace the cached one when they are saved.
+        if cached_ip := await self.address.async_load():
+            self.device.ip = cached_ip
+
+    async def async_shutdown(self) -> None:
+        """Close the frame capture when the integration is unloaded."""
+        await super().async_shutdown()
+        if self.recorder:
+            await self.hass.async_add_executor_job(self.recorder.close)
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Build the shared entity attributes, then update all entities.
+
+        Attributes are read several times per state write, so they are built
+        here once per update, or when the queued commands change, instead.
+        """
+        device = self.device
+        self.attributes = MappingProxyType(
+            {
+                "is_connected": device.is_connected,
+                "state_code": device.state,
+                "state_desc": device.state_description,
+                "error_code": device.error_code,
+                "error": device.error_description,
+                "pending_commands": self.journal.pending,
+                "data_age": self.data_age,
+            }
+        )
+        super().async_update_listeners()
+
+    @property
+    def data_age(self) -> int | None:
+        """Return the seconds since the last successful update."""
+        if self._updated_at is None:
+            return None
+        return round(time.monotonic() - self._updated_at)
 
     async def async_update_data(self) -> Device:
         """Fetch data from API endpoint.
 
         This is the place to retrieve and pre-process the data into an appropriate data structure
         to be used to provide values for all your entities.
+
+        Every update, scheduled or requested, shares the update already in
+        flight. Entities refresh after every command, so during scenes and
+        automations many refreshes arrive together; they all wait for the same
+        one, and one requested shortly after a successful update returns the
+        data right away.
+        """
+        if self._refresh_task is None:
+            if (
+                self.last_update_success
+                and self._refreshed_at is not None
+                and time.monotonic() - self._refreshed_at < REFRESH_FRESHNESS
+            ):
+                return self.device
+            self._refresh_task = self.hass.async_create_task(
+                self.__async_shared_update()
+            )
+        # A cancelled caller must not cancel the update of the others
+        return await asyncio.shield(self._refresh_task)
+
+    async def __async_shared_update(self) -> Device:
+        """Read the device, serving stale data during short outages.
+
+        A failed update keeps serving the last good data until it is older
+        than the staleness window, so short outages do not make the entities
+        unavailable. The next polls keep trying to revalidate it. A window of
+        0 never serves stale data.
         """
+        try:
+            return await self.__async_fetch_data()
+        except UpdateFailed as err:
+            age = self.data_age
+            if not self.stale_window or age is None or age > self.stale_window:
+                raise
+            _LOGGER.warning(
+                "Update failed, serving data from %s seconds ago: %s", age, err
+            )
+            return self.device
+        finally:
+            self._refresh_task = None
+
+    async def __async_fetch_data(self) -> Device:
+        """Read the device.
+
+        The whole update shares a deadline: the TCP attempt gets at most its
+        share, and the cloud fallback the rest, so a poll never runs into the
+        next one.
+        """
+        deadline = Deadline(UPDATE_DEADLINE)
+        if self._updated_at is not None:
+            # Only the poll after the first update is offset
+            self.update_interval = timedelta(seconds=UPDATE_INTERVAL)
         try:
             # ----------------------------------------------------------------------------
             # Get the data from your api
             # NOTE: Change this to use a real api call for data
             # ----------------------------------------------------------------------------
-            try:
-                await self.__initiate_tcp()
-                await self.__update_from_local()
-            except TCPCommunicationError as e:
-                _LOGGER.error(
-                    "It was not possible to connect to 4Heat device(%s:%s)",
-                    self.device.ip,
-                    str(self.device.port),
+            # Only the tiers that are due are decoded
+            tiers = self.tiers.due()
+            # A transport that keeps failing is only retried after its backoff
+            decision = "tcp_backoff"
+            if self.backoff["tcp"].ready:
+                try:
+                    await self.__initiate_tcp(deadline)
+                    async with deadline.timeout(TCP_TIMEOUT):
+                        await self.__update_from_local(tiers)
+                    if self.backoff["tcp"].failures:
+                        # Reconnected, the device may have been updated meanwhile
+                        self.tiers.invalidate(TIER_IDENTITY)
+                    self.backoff["tcp"].succeeded()
+                    self.address.set(self.tcp_client.ip)
+                    self.com_type = "TCP"
+                    decision = None
+                except (TCPCommunicationError, TimeoutError) as e:
+                    delay = self.backoff["tcp"].failed()
+                    _LOGGER.error(
+                        "It was not possible to connect to 4Heat device(%s:%s)",
+                        self.device.ip,
+                        str(self.device.port),
+                    )
+                    _LOGGER.error(repr(e))
+                    _LOGGER.warning(
+                        "TCP retry in %.0f seconds%s",
+                        delay,
+                        "" if self.local_only else ", will try to connect to cloud",
+                    )
+                    decision = "tcp_failed"
+                    if self.backoff["tcp"].failures >= ADDRESS_RESOLVE_FAILURES:
+                        # The device may have a new address, resolve it again
+                        # before the next attempt
+                        self.address.invalidate()
+                        self.tcp_client = None
+
+            if decision is not None:
+                await self.__update_from_cloud(decision, deadline, tiers)
+                self.com_type = "CLOUD"
+                self.__follow_address()
+            elif TIER_IDENTITY in tiers and not await self.__refresh_identity(deadline):
+                tiers -= {TIER_IDENTITY}
+            self.tiers.done(tiers)
+
+            now = time.time()
+            self.history.append(
+                now,
+                self.device.room_temperature,
+                self.device.target_temperature,
+                self.device.state,
+            )
+            self.statistics.update(now, self.device.state, self.device.room_temperature)
+            self._refreshed_at = time.monotonic()
+            self._updated_at = self._refreshed_at
+
+            if self.journal.pending and (
+                self._replay_task is None or self._replay_task.done()
+            ):
+                self._replay_task = self.hass.async_create_background_task(
+                    self.__async_replay_journal(), f"{DOMAIN} {self.code} replay"
                 )
-                _LOGGER.error(e)
-                _LOGGER.warning("Will try to connect to cloud")
-                await self.__update_from_cloud()
-
-            _LOGGER.debug("Data Loaded: %s", self.device.to_dict())
         except APIConnectionError as err:
             _LOGGER.error(err)
             raise UpdateFailed(err) from err
+        except TimeoutError as err:
+            raise UpdateFailed(
+                f"Update did not finish within {UPDATE_DEADLINE} seconds"
+            ) from err
         except Exception as err:
             _LOGGER.error(err, stack_info=True)
             raise UpdateFailed(f"Error communicating with API: {err}") from err
 
         return self.device
 
-    async def async_set_temperature(self, temperature: int) -> bool:
-        """Set temperature."""
+    async def __send_local(self, kind: str, value) -> bytes:
+        if kind == COMMAND_POWER:
+            if value:
+                return await self.tcp_client.turn_on()
+            return await self.tcp_client.turn_off()
+        if kind == COMMAND_PARAMETERS:
+            return await self.tcp_client.write_records(value)
+        if kind == COMMAND_POWER_LEVEL:
+            return await self.tcp_client.set_power_level(self.device, value)
+        if kind.startswith(COMMAND_ZONE_TEMPERATURE):
+            zone, temperature = value
+            return await self.tcp_client.set_zone_temperature(
+                self.device, zone, temperature
+            )
+        return await self.tcp_client.set_temperature(self.device, value)
+
+    async def __send_cloud(self, kind: str, value, deadline: Deadline) -> str:
+        if self.api is None:
+            raise APIConnectionError("Device unreachable, cloud disabled in local mode")
+        async with deadline.timeout(AUTH_TIMEOUT):
+            await self.async_auth()
+        async with deadline.timeout():
+            if kind == COMMAND_POWER:
+                if value:
+                    return await self.api.turn_on(self.token)
+                return await self.api.turn_off(self.token)
+            if kind == COMMAND_PARAMETERS:
+                return await self.api.write_records(self.token, value)
+            if kind == COMMAND_POWER_LEVEL:
+                return await self.api.set_power_level(self.device, self.token, value)
+            if kind.startswith(COMMAND_ZONE_TEMPERATURE):
+                zone, temperature = value
+                return await self.api.set_zone_temperature(
+                    self.device, self.token, zone, temperature
+                )
+            return await self.api.set_temperature(self.device, self.token, value)
+
+    async def __deliver(self, kind: str, value) -> bool:
+        """Send a command over TCP, falling back to the cloud."""
+        deadline = Deadline(COMMAND_DEADLINE)
         resp = None
         try:
-            try:
-                await self.__initiate_tcp()
-                resp = await self.tcp_client.set_temperature(self.device, temperature)
-            except TCPCommunicationError as e:
-                _LOGGER.error(e)
-
-            if resp is None:
+            await self.__initiate_tcp(deadline)
+            async with deadline.timeout(TCP_TIMEOUT):
+                resp = await self.__send_local(kind, value)
+        except (TCPCommunicationError, TimeoutError) as e:
+            _LOGGER.error(repr(e))
+
+        if resp is None:
+            if not self.local_only:
                 _LOGGER.warning("Will try to send command via cloud")
+            resp = await self.__send_cloud(kind, value, deadline)
 
-                await self.async_auth()
-                resp = await self.api.set_temperature(
-                    self.device, self.token, temperature
-                )
+        return resp is not None
 
-        except APIConnectionError as err:
-            _LOGGER.error(err)
-            raise UpdateFailed(err) from err
+    async def __async_command(self, kind: str, value) -> bool:
+        """Deliver a command, queueing it when no transport is available."""
+        try:
+            delivered = await self.__deliver(kind, value)
+        except (APIAuthError, APIConnectionError, TimeoutError) as err:
+            _LOGGER.error(repr(err))
+            _LOGGER.warning(
+                "Device unreachable, %s command queued until it recovers", kind
+            )
+            self.journal.add(kind, value)
+            self.async_update_listeners()
+            return False
         except Exception as err:
             raise UpdateFailed(f"Error communicating with API: {err}") from err
 
+        # A delivered command supersedes any queued intent of the same kind
+        self.journal.remove(kind)
+        # and makes the cached data outdated
+        self._refreshed_at = None
+
         await asyncio.sleep(10)
 
-        return resp is not None
+        return delivered
 
-    async def async_turn_off(self) -> bool:
-        """Turn the device off."""
-        resp = None
-        try:
+    async def __async_replay_journal(self) -> None:
+        """Deliver the queued commands once a transport is back."""
+        replayed = False
+        for kind, value in self.journal.pending.items():
             try:
-                await self.__initiate_tcp()
-                resp = await self.tcp_client.turn_off()
-            except TCPCommunicationError as e:
-                _LOGGER.error(e)
-
-            if resp is None:
-                _LOGGER.warning("Will try to send command via cloud")
+                if await self.__deliver(kind, value):
+                    _LOGGER.info("Delivered queued %s command", kind)
+                    self.journal.remove(kind)
+                    self._refreshed_at = None
+                    replayed = True
+            except Exception as err:  # noqa: BLE001
+                _LOGGER.warning("Queued %s command not delivered: %s", kind, err)
+                break
+
+        if replayed:
+            await self.async_request_refresh()
 
-                await self.async_auth()
-                resp = await self.api.turn_off(self.token)
+    async def async_set_temperature(self, temperature: int) -> bool:
+        """Set temperature."""
+        return await self.__async_command(COMMAND_TEMPERATURE, temperature)
 
-        except APIConnectionError as err:
-            _LOGGER.error(err)
-            raise UpdateFailed(err) from err
-        except Exception as err:
-            raise UpdateFailed(f"Error communicating with API: {err}") from err
+    async def async_set_zone_temperature(self, zone: int, temperature: int) -> bool:
+        """Set the temperature of a thermostat zone, in device units."""
+        return await self.__async_command(zone_command(zone), [zone, temperature])
 
-        await asyncio.sleep(10)
+    async def async_set_power_level(self, level: int) -> bool:
+        """Set the power level of the stove."""
+        return await self.__async_command(COMMAND_POWER_LEVEL, level)
 
-        return resp is not None
+    async def async_set_parameters(
+        self, values: dict[int, float]
+    ) -> dict[str, dict[str, Any]]:
+        """Write parameters in one command and verify them with one read.
 
-    async def async_turn_on(self) -> bool:
-        """Turn the device on."""
-        resp = None
-        try:
-            try:
-                await self.__initiate_tcp()
-                resp = await self.tcp_client.turn_on()
-            except TCPCommunicationError as e:
-                _LOGGER.error(e)
+        All values are validated before anything is sent, a ValueError names
+        the first invalid one. Returns the value read back for each parameter.
+        """
+        writes = {
+            id_par: self.device.parameter_write(id_par, value)
+            for id_par, value in values.items()
+        }
 
-            if resp is None:
-                _LOGGER.warning("Will try to send command via cloud")
+        await self.__deliver(
+            COMMAND_PARAMETERS, [record for record, _ in writes.values()]
+        )
 
-                await self.async_auth()
-                resp = await self.api.turn_on(self.token)
+        await asyncio.sleep(10)
 
-        except APIConnectionError as err:
-            _LOGGER.error(err)
-            raise UpdateFailed(err) from err
-        except Exception as err:
-            raise UpdateFailed(f"Error communicating with API: {err}") from err
+        # A refresh in flight may have read the device before the write, the
+        # read back must be a new one, decoding the parameters
+        if self._refresh_task is not None:
+            with suppress(UpdateFailed):
+                await asyncio.shield(self._refresh_task)
+        self.tiers.invalidate(TIER_PARAMETERS)
+        self._refreshed_at = None
+        updated_at = self._updated_at
+        await self.async_refresh()
+
+        # Stale data served during an outage does not verify anything
+        return self.device.parameter_readback(
+            values,
+            {id_par: raw for id_par, (_, raw) in writes.items()},
+            self._updated_at != updated_at,
+        )
 
-        await asyncio.sleep(10)
+    async def async_turn_off(self) -> bool:
+        """Turn the device off."""
+        return await self.__async_command(COMMAND_POWER, False)
 
-        return resp is not None
+    async def async_turn_on(self) -> bool:
+        """Turn the device on."""
+        return await self.__async_command(COMMAND_POWER, True)
@@ -0,0 +1,24 @@
+"""Deadline budgets for 4Heat requests."""
+
+import asyncio
+import time
+
+
+class Deadline:
+    """A total time budget shared by the steps of an update or command."""
+
+    def __init__(self, seconds: float) -> None:
+        """Initialise."""
+        self.expires = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        """Return the seconds left, never less than zero."""
+        return max(0.0, self.expires - time.monotonic())
+
+    def timeout(self, share: float | None = None) -> asyncio.Timeout:
+        """Return a timeout for a step, capped at its share of the budget.
+
+        The step is cancelled, and TimeoutError raised, when the budget runs out.
+        """
+        remaining = self.remaining()
+        return asyncio.timeout(remaining if share is None else min(share, remaining))
@@ -1,11 +1,27 @@
 """Device classes for 4Heat Integration."""
 
+import binascii
+from collections.abc import Iterable
 from datetime import datetime
 import json
 import logging
+import math
+import struct
 from typing import Any
 
-from .const import DEVICE_ERRORS, TCP_PORT
+from .const import DEVICE_ERRORS, TCP_PORT, WRITE_RECORD_CODE
+from .frame import iter_records
+from .records import MAIN_VALUES_DECIMALS, RecordField, map_fields, scale
+from .tiers import ALL_TIERS, TIER_HOT, TIER_IDENTITY, TIER_PARAMETERS
+
+MAIN_VALUES_CODE = b"10"
+PARAMETER_CODE = b"0e"
+TEST_OUTPUT_CODE = b"12"
+ZONE_CODE = b"22"
+POWER_CODE = b"06"
+STATE_INFO_81_CODE = b"0c81"
+# Status, error code and room temperature of a binary main values record
+_MAIN_VALUES = struct.Struct(">5xBB3xh")
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -25,9 +41,16 @@ class Device:
     is_connected: bool
     software_version: str
     set_temperature_command: str
-
-    def __init__(self) -> None:
+    parameters: dict[int, dict[str, Any]]
+    test_outputs: dict[int, dict[str, Any]]
+    values: dict[str, int | float]
+    zones: dict[int, dict[str, Any]]
+    power: dict[str, Any]
+    power_level: int | None
+
+    def __init__(self, loader: "_DeviceLoader | None" = None) -> None:
         """Initialise."""
+        self._loader = loader
         self.state = 991
         self.target_temperature = 991
         self.room_temperature = 991
@@ -39,10 +62,17 @@ class Device:
         self.is_connected = False
         self.software_version = None
         self.set_temperature_command = None
+        self.parameters = {}
+        self.test_outputs = {}
+        self.values = {}
+        self._parameter_table = None
+        self.zones = {}
+        self.power = {}
+        self.power_level = None
 
     def to_dict(self) -> dict[str, Any]:
         """Serialize."""
-        return self.__dict__
+        return {key: value for key, value in self.__dict__.items() if key[0] != "_"}
 
     @property
     def is_on(self) -> bool:
@@ -66,21 +96,110 @@ class Device:
     @property
     def state_description(self) -> str:
         """Property state description."""
+        return (self._loader or device_loader).describe_state(self.state)
+
+    def parameter_table(self) -> dict[str, dict[str, dict[str, Any]]]:
+        """Return the decoded parameters and test outputs, scaled.
+
+        The table is built once from the records of the last parameters
+        refresh and kept until the next one.
+        """
+        if self._parameter_table is None:
+            self._parameter_table = {
+                "parameters": {
+                    str(id_par): _scale_row(row)
+                    for id_par, row in sorted(self.parameters.items())
+                },
+                "test_outputs": {
+                    str(id_out): _scale_row(row)
+                    for id_out, row in sorted(self.test_outputs.items())
+                },
+            }
+        return self._parameter_table
 
-        if device_loader.state_descriptor:
-            state_desc = next(
-                (
-                    item
-                    for item in device_loader.state_descriptor
-                    if item["val"] == self.state
-                ),
-                None,
-            )
+    def invalidate_parameter_table(self) -> None:
+        """Drop the parameter table, after parameters were decoded again."""
+        self._parameter_table = None
 
-            if state_desc:
-                return state_desc.get("descrizione_pt", "Unknown")
+    def zone_temperature_command(self, zone: int, value: int) -> str:
+        """Return the command writing the setpoint of a thermostat zone.
 
-        return "Unknown"
+        It is built like the one of the main thermostat: the write code, the
+        record up to its setpoint, the new setpoint and the rest of the record.
+        """
+        if zone not in self.zones:
+            raise ValueError(f"Unknown thermostat zone {zone}")
+        record = self.zones[zone]["record"]
+        return write_command([f"{record[:10]}{value & 0xFFFF:04x}{record[14:32]}"])
+
+    @property
+    def power_level_writable(self) -> bool:
+        """Return if the power level can be set, from a writable pw_all record."""
+        return bool(self.power) and not self.power["read_only"]
+
+    def validate_power_level(self, level: int) -> None:
+        """Raise ValueError when the power level can not be set to level."""
+        if not self.power_level_writable:
+            raise ValueError("Power level can not be set on this device")
+        if not self.power["min"] <= level <= self.power["max"]:
+            raise ValueError(
+                f"Power level must be between {self.power['min']} and {self.power['max']}"
+            )
+
+    def power_level_command(self, level: int) -> str:
+        """Return the command writing the power level of the stove."""
+        self.validate_power_level(level)
+        record = self.power["record"]
+        return write_command([f"{record[:4]}{level:02x}{record[6:]}"])
+
+    def parameter_write(self, id_par: int, value: float) -> tuple[str, int]:
+        """Return the record writing a parameter and its value in device units.
+
+        The value is validated against the decimals, min, max and step decoded
+        from the device, the record is built like a setpoint write.
+        """
+        if id_par not in self.parameters:
+            raise ValueError(f"Unknown parameter {id_par}")
+        row = self.parameters[id_par]
+        if row["read_only"]:
+            raise ValueError(f"Parameter {id_par} is read only")
+
+        units = value * 10 ** row["pos_punto"]
+        raw = round(units)
+        if not math.isclose(raw, units, abs_tol=1e-6):
+            # Never round a value the device can not hold
+            raise ValueError(
+                f"Parameter {id_par} must have at most {row['pos_punto']} decimals"
+            )
+        scaled = _scale_row(row)
+        if not row["min"] <= raw <= row["max"]:
+            raise ValueError(
+                f"Parameter {id_par} must be between {scaled['min']} and {scaled['max']}"
+            )
+        if row["step_incr"] and (raw - row["min"]) % row["step_incr"]:
+            raise ValueError(f"Parameter {id_par} must change by {scaled['step']}")
+
+        record = row["record"]
+        return f"{record[:6]}{raw & 0xFFFF:04x}{record[10:28]}", raw
+
+    def parameter_readback(
+        self, requested: dict[int, float], written: dict[int, int], read: bool
+    ) -> dict[str, dict[str, Any]]:
+        """Return the value read back for each written parameter.
+
+        A parameter is verified when the read back succeeded and holds the
+        value written, in device units.
+        """
+        table = self.parameter_table()["parameters"]
+        return {
+            str(id_par): {
+                "requested": requested[id_par],
+                "value": table.get(str(id_par), {}).get("value") if read else None,
+                "verified": read
+                and self.parameters.get(id_par, {}).get("value") == raw,
+            }
+            for id_par, raw in written.items()
+        }
 
 
 class _DeviceLoader:
@@ -89,6 +208,10 @@ class _DeviceLoader:
     file_map = None
     main_thermostat: int = 12
     state_descriptor = []
+    state_descriptions: dict[int, str] = {}
+    cloud_message_key: tuple | None = None
+    fields: list[RecordField] | None = None
+    fields_by_position: dict[int, tuple[RecordField, ...]] = {}
 
     def initiate(self, file_map: dict[str, Any]) -> None:
         """Initialise DeviceLoader."""
@@ -99,6 +222,15 @@ class _DeviceLoader:
             if com_therm:
                 self.main_thermostat = int(com_therm.get("scritt_termostato", 12)) - 1
             self.state_descriptor = file_map.get("lingue_stati", [])
+            # Indexed by code, the first description of a code wins
+            self.state_descriptions = {
+                item["val"]: item.get("descrizione_pt", "Unknown")
+                for item in reversed(self.state_descriptor)
+            }
+
+    def describe_state(self, state: int) -> str:
+        """Return the description of a state code from the file map."""
+        return self.state_descriptions.get(state, "Unknown")
 
     def __convertSignedValue(self, value: int) -> int:
         """Convert a signed value to an integer."""
@@ -152,6 +284,7 @@ class _DeviceLoader:
                 "min": int(command[6:8], 16),
                 "max": int(command[8:10], 16),
                 "read_only": int(command[10:12], 16),
+                "record": command,
             }
         elif command_type == 8:  # crono_enb
             resp = {
@@ -221,6 +354,7 @@ class _DeviceLoader:
                 "pos_punto": int(command[20:22], 16),
                 "step_incr": int(command[22:26], 16),
                 "id_par": int(command[26:30], 16),
+                "record": command,
             }
         elif command_type == 16:  # main_values
             if len(command) == 36:
@@ -269,90 +403,241 @@ class _DeviceLoader:
                 "max": self.__convertSignedValue(int(command[18:22], 16)),
                 "temperature": self.__convertSignedValue(int(command[26:30], 16)),
                 "pos_punto": int(command[30:32], 16),
+                "record": command,
             }
 
         return resp
 
-    def load_from_local(self, device: Device, received_data: str):
-        """Translate the received data and return the device status."""
-
-        _LOGGER.debug("Loading Device with local response data: %s", received_data)
-
+    def map_fields(self, records: Iterable[bytes | memoryview | str]) -> None:
+        """Map the values entities are made of from the records of a frame."""
+        self.fields = map_fields(
+            record.lower().encode() if isinstance(record, str) else record
+            for record in records
+        )
+        by_position: dict[int, list[RecordField]] = {}
+        for record_field in self.fields:
+            by_position.setdefault(record_field.position, []).append(record_field)
+        self.fields_by_position = {
+            position: tuple(fields) for position, fields in by_position.items()
+        }
+
+    def __read_fields(
+        self, device: Device, fields: tuple[RecordField, ...], record
+    ) -> None:
+        raw = binascii.unhexlify(record)
+        for record_field in fields:
+            device.values[record_field.key] = record_field.unpack(raw)
+
+    def __read_power(
+        self, device: Device, power: dict[str, Any] | None, liv_pot: str | None
+    ) -> None:
+        """Set the power level, from the pw_all record or else state_info_81."""
+        device.power = power or {}
+        if power:
+            device.power_level = power["value"]
+        elif liv_pot and liv_pot.isdigit():
+            device.power_level = int(liv_pot)
+        else:
+            device.power_level = None
+
+    def __read_parameter(self, device: Device, resp: dict[str, Any]) -> None:
+        if resp["command_type"] == "par_value":
+            device.parameters[resp["id_par"]] = resp
+        else:
+            device.test_outputs[resp["id"]] = resp
+        device.invalidate_parameter_table()
+
+    def load_from_local(
+        self,
+        device: Device,
+        received_data: bytes,
+        tiers: frozenset[str] = ALL_TIERS,
+    ):
+        """Translate the received data and return the device status.
+
+        Only the records the device status is made of are decoded, straight
+        from the frame: the main values record is unpacked from its binary
+        form and the thermostat record is the only one turned into text.
+        Parameter records are only decoded when their tier is due, and other
+        records only for the values mapped from the first frame.
+        """
+
+        parameters = TIER_PARAMETERS in tiers
         try:
             if received_data:
-                json_data = json.loads(received_data)
-
-                if json_data[0] == "2WL":
-                    json_data.pop(0)
-                    json_data.pop(0)
+                if self.fields is None:
+                    self.map_fields(iter_records(received_data))
+
+                main_values = thermostat = power = liv_pot = None
+                zones = {}
+                for position, record in enumerate(iter_records(received_data)):
+                    if fields := self.fields_by_position.get(position):
+                        self.__read_fields(device, fields, record)
+                    if record[:2] == MAIN_VALUES_CODE:
+                        main_values = binascii.unhexlify(record)
+                    elif position == self.main_thermostat:
+                        thermostat = record
+                    elif record[:2] == ZONE_CODE:
+                        zone = self.__read_command_response(str(record, "ascii"))
+                        zones[zone["id"]] = zone
+                    elif record[:2] == POWER_CODE and power is None:
+                        power = self.__read_command_response(str(record, "ascii"))
+                    elif record[:4] == STATE_INFO_81_CODE:
+                        liv_pot = self.__read_command_response(
+                            str(record, "ascii")
+                        ).get("liv_pot")
+                    elif parameters and record[:2] in (
+                        PARAMETER_CODE,
+                        TEST_OUTPUT_CODE,
+                    ):
+                        self.__read_parameter(
+                            device,
+                            self.__read_command_response(str(record, "ascii")),
+                        )
+
+                if main_values is None or thermostat is None:
+                    raise DeviceDataLoadError("Frame without main values or thermostat")
 
-                for data in json_data:
-                    resp = self.__read_command_response(data)
-                    command_type = resp.get("command_type", "")
-
-                    if command_type == "main_values":
-                        main_resp = resp
-                    elif data == json_data[self.main_thermostat]:
-                        thermostate_resp = resp
-
-                device.state = main_resp.get("status", 999)
-                device.error_code = main_resp.get("cod_error", 999)
-                device.room_temperature = main_resp.get("temp_princ", 0)
+                (
+                    device.state,
+                    device.error_code,
+                    room_temperature,
+                ) = _MAIN_VALUES.unpack_from(main_values)
+                # Scaled like the other temperature of the record
+                device.room_temperature = scale(
+                    room_temperature, main_values, MAIN_VALUES_DECIMALS
+                )
 
+                thermostate_resp = self.__read_command_response(
+                    str(thermostat, "ascii")
+                )
+                if parameters and thermostate_resp.get("command_type") == "testout":
+                    self.__read_parameter(device, thermostate_resp)
                 device.target_temperature = thermostate_resp.get("value", 0)
                 device.set_temperature_command = thermostate_resp.get(
                     "set_temperature_command", ""
                 )
+                device.zones = zones
+                self.__read_power(device, power, liv_pot)
 
             device.last_update = datetime.now()
             device.state_timestamp = device.last_update
-        except (KeyError, ValueError, TypeError) as e:
+        except (KeyError, ValueError, TypeError, struct.error) as e:
             raise DeviceDataLoadError from e
 
-    def load_from_cloud(self, device: Device, received_data: dict[str, Any]):
-        """Translate the received data and return the device status."""
+    def load_from_cloud(
+        self,
+        device: Device,
+        received_data: dict[str, Any],
+        tiers: frozenset[str] = ALL_TIERS,
+    ):
+        """Translate the received data and return the device status.
+
+        Only the tiers given are decoded, so the cloud can also be read for
+        the identity of a device polled over TCP.
+        """
 
         try:
-            _LOGGER.debug("Loading Device with cloud response data: %s", received_data)
+            if TIER_IDENTITY in tiers:
+                device.name = received_data.get("Name")
+                device.software_version = f"{received_data.get('ProductVersion', 0).lstrip('0')}.{received_data.get('FirmwareVersion')}.{received_data.get('FirmwareRevision')}"
+
+            if TIER_HOT not in tiers:
+                return
 
-            device.name = received_data.get("Name")
             device.ip = received_data.get("IpAddress")
             device.is_connected = received_data.get("IsConnected")
             device.state_timestamp = datetime.fromisoformat(
                 received_data.get("LastTimestamp")
             )
-            device.software_version = f"{received_data.get("ProductVersion", 0).lstrip("0")}.{received_data.get("FirmwareVersion")}.{received_data.get("FirmwareRevision")}"
 
             last_message_received = received_data.get("LastMessageReceived")
 
+            # The cloud keeps returning the last message until the device
+            # sends a new one, which is then already decoded. It is decoded
+            # again when its parameters are due but were skipped last time.
+            parameters = TIER_PARAMETERS in tiers
+            message_key = (
+                received_data.get("LastTimestamp"),
+                hash(last_message_received),
+            )
+            if last_message_received and self.cloud_message_key in (
+                (*message_key, True),
+                (*message_key, parameters),
+            ):
+                device.last_update = datetime.now()
+                return
+
             if last_message_received:
                 json_last_msg = json.loads(last_message_received)
                 values = json_last_msg.get("Values", None)
 
                 if values:
-                    for data in values:
+                    zones = {}
+                    power = liv_pot = None
+                    for position, data in enumerate(values):
                         resp = self.__read_command_response(data)
                         command_type = resp.get("command_type", "")
 
                         if command_type == "main_values":
                             main_resp = resp
-                        elif data == values[self.main_thermostat]:
+                        elif position == self.main_thermostat:
                             thermostate_resp = resp
+                        elif command_type == "th_all_2":
+                            zones[resp["id"]] = resp
+                        elif command_type == "pw_all" and power is None:
+                            power = resp
+                        elif command_type == "state_info_81":
+                            liv_pot = resp.get("liv_pot")
+
+                        if command_type in ("par_value", "testout") and parameters:
+                            self.__read_parameter(device, resp)
 
                     device.state = main_resp.get("status", 999)
                     device.error_code = main_resp.get("cod_error", 999)
                     device.room_temperature = main_resp.get("temp_princ", 0)
+                    if places := main_resp.get("pos_punto"):
+                        device.room_temperature /= 10**places
 
                     device.target_temperature = thermostate_resp.get("value", 0)
                     device.set_temperature_command = thermostate_resp.get(
                         "set_temperature_command", ""
                     )
+                    device.zones = zones
+                    self.__read_power(device, power, liv_pot)
+
+                    if self.fields is None:
+                        self.map_fields(values)
+                    for position, fields in self.fields_by_position.items():
+                        if position < len(values):
+                            self.__read_fields(device, fields, values[position])
 
                     device.last_update = datetime.now()
-        except (KeyError, ValueError, TypeError) as e:
+
+            self.cloud_message_key = (*message_key, parameters)
+        except (KeyError, ValueError, TypeError, struct.error) as e:
             raise DeviceDataLoadError from e
 
 
+def write_command(records: list[str]) -> str:
+    """Return the command writing records, each with its new value."""
+    writes = ",".join(f'"{WRITE_RECORD_CODE}{record}"' for record in records)
+    return f'["2WC","{len(records)}",{writes}]'
+
+
+def _scale_row(row: dict[str, Any]) -> dict[str, Any]:
+    """Return a parameter or test output row in real units."""
+    factor = 10 ** row["pos_punto"]
+    return {
+        "value": row["value"] / factor,
+        "min": row["min"] / factor,
+        "max": row["max"] / factor,
+        "step": row["step_incr"] / factor,
+        "decimals": row["pos_punto"],
+        "read_only": bool(row["read_only"]),
+    }
+
+
 device_loader = _DeviceLoader()
 
 
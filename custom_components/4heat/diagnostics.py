@@ -0,0 +1,58 @@
+"""Diagnostics support for 4Heat integration."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_PASSWORD, CONF_PIN, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .coordinator import FourHeatDataUpdateCoordinator
+
+TO_REDACT = {
+    CONF_PASSWORD,
+    CONF_PIN,
+    CONF_USERNAME,
+    "access_token",
+    "refresh_token",
+    "userName",
+    "Pin",
+}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, config_entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: FourHeatDataUpdateCoordinator = hass.data[DOMAIN][
+        config_entry.entry_id
+    ].coordinator
+
+    return {
+        "entry": async_redact_data(config_entry.as_dict(), TO_REDACT),
+        "device": async_redact_data(dict(coordinator.device.to_dict()), TO_REDACT),
+        "transport": {
+            "com_type": coordinator.com_type,
+            "local_only": coordinator.local_only,
+            "tcp_client": coordinator.tcp_client is not None,
+            "start_offset": round(coordinator.start_offset, 1),
+            "address_expired": coordinator.address.expired,
+            "backoff": {
+                transport: backoff.as_dict()
+                for transport, backoff in coordinator.backoff.items()
+            },
+        },
+        "statistics": {
+            "time_in_state": coordinator.statistics.time_in_state,
+            "on_time": coordinator.statistics.on_time,
+            "duty_cycle": coordinator.statistics.duty_cycle,
+            "heat_up_rate": coordinator.statistics.heat_up_rate,
+            "last_ignition_duration": coordinator.statistics.last_ignition_duration,
+        },
+        "refresh_tiers": coordinator.tiers.as_dict(),
+        "history_samples": len(coordinator.history),
+        "frames": async_redact_data(coordinator.frames.as_list(), TO_REDACT),
+    }
@@ -0,0 +1,125 @@
+"""Discovery of 4Heat devices on the local network."""
+
+from __future__ import annotations
+
+import asyncio
+import ipaddress
+import logging
+import time
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import (
+    COMMAND_READ_DATA,
+    DISCOVERY_CACHE_TTL,
+    DISCOVERY_CONCURRENCY,
+    DISCOVERY_MAX_HOSTS,
+    DISCOVERY_TIMEOUT,
+    DOMAIN,
+    TCP_PORT,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_DISCOVERY = f"{DOMAIN}_discovery"
+
+
+def parse_network(value: str) -> ipaddress.IPv4Network:
+    """Return the network to scan, raising ValueError when it is not usable."""
+    network = ipaddress.ip_network(value, strict=False)
+    if not isinstance(network, ipaddress.IPv4Network):
+        raise ValueError(f"{value} is not an IPv4 network")
+    if network.num_addresses > DISCOVERY_MAX_HOSTS:
+        raise ValueError(f"{value} has more than {DISCOVERY_MAX_HOSTS} addresses")
+    return network
+
+
+def default_network(ip: str) -> str:
+    """Return the /24 network of an address."""
+    return str(ipaddress.ip_network(f"{ip}/24", strict=False))
+
+
+class LanDiscovery:
+    """Find 4Heat devices by probing the hosts of a network.
+
+    Every host is sent the same read the integration polls with, on the
+    device port, and those replying with a data frame are devices. Hosts are
+    probed concurrently, with a bound, and the devices found are cached per
+    network.
+    """
+
+    def __init__(
+        self,
+        port: int = TCP_PORT,
+        concurrency: int = DISCOVERY_CONCURRENCY,
+        timeout: float = DISCOVERY_TIMEOUT,
+        ttl: float = DISCOVERY_CACHE_TTL,
+    ) -> None:
+        """Initialise."""
+        self.port = port
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.ttl = ttl
+        self._lock = asyncio.Lock()
+        self._found: dict[str, tuple[float, list[str]]] = {}
+
+    async def probe(self, ip: str) -> bool:
+        """Return if a 4Heat device answers at the address."""
+        writer = None
+        try:
+            async with asyncio.timeout(self.timeout):
+                reader, writer = await asyncio.open_connection(ip, self.port)
+                # Devices need a moment before they accept a request
+                await asyncio.sleep(0.5)
+                writer.write(COMMAND_READ_DATA.encode())
+                await writer.drain()
+                received_data = await reader.read(1024)
+        except (OSError, TimeoutError):
+            return False
+        finally:
+            if writer is not None:
+                writer.close()
+        return received_data.startswith(b'["2WL"')
+
+    async def __scan(self, network: ipaddress.IPv4Network) -> list[str]:
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def probe(ip: str) -> bool:
+            async with semaphore:
+                return await self.probe(ip)
+
+        hosts = [str(host) for host in network.hosts()]
+        started = time.monotonic()
+        answers = await asyncio.gather(*(probe(ip) for ip in hosts))
+        found = [ip for ip, answer in zip(hosts, answers, strict=True) if answer]
+        _LOGGER.debug(
+            "Found 4Heat devices %s in %s in %.1f seconds",
+            found,
+            network,
+            time.monotonic() - started,
+        )
+        return found
+
+    async def async_discover(self, network: str, refresh: bool = False) -> list[str]:
+        """Return the addresses of the devices on a network.
+
+        Results younger than the cache TTL are returned without probing, and
+        concurrent callers share a single scan.
+        """
+        parsed = parse_network(network)
+        key = str(parsed)
+        async with self._lock:
+            cached = self._found.get(key)
+            if not refresh and cached and time.monotonic() - cached[0] < self.ttl:
+                return cached[1]
+            found = await self.__scan(parsed)
+            self._found[key] = (time.monotonic(), found)
+            return found
+
+
+@callback
+def async_get_discovery(hass: HomeAssistant) -> LanDiscovery:
+    """Return the discovery shared by the config flow and all devices."""
+    if DATA_DISCOVERY not in hass.data:
+        hass.data[DATA_DISCOVERY] = LanDiscovery()
+    return hass.data[DATA_DISCOVERY]
@@ -0,0 +1,85 @@
+"""Parser of the frames read from 4Heat devices."""
+
+from collections.abc import Iterator
+import re
+
+READ_PREFIX = b'["2WL",'
+
+_QUOTE = ord('"')
+_COMMA = ord(",")
+_CLOSE = ord("]")
+_SPACES = b" \t\r\n"
+_TRAILING = b" \t\r\n\x00"
+_UPPER_HEX = re.compile(rb"[A-F]")
+
+
+class FrameError(ValueError):
+    """Exception class for a malformed frame."""
+
+
+def _skip_spaces(frame: bytes, pos: int, end: int) -> int:
+    while pos < end and frame[pos] in _SPACES:
+        pos += 1
+    if pos >= end:
+        raise FrameError("Frame is truncated")
+    return pos
+
+
+def iter_records(frame: bytes) -> Iterator[memoryview]:
+    """Yield the records of a "2WL" reply as views into the frame.
+
+    The reply is a JSON list of strings, the command, the record count and the
+    hex encoded records. It is scanned in place: the envelope is validated as
+    it goes and each record is yielded as a memoryview, without decoding the
+    frame or copying the records.
+
+    Records are yielded in lower case, so their codes compare the same way
+    everywhere. Frames with upper case hex digits are copied once for that.
+    """
+    end = len(frame)
+    while end and frame[end - 1] in _TRAILING:
+        end -= 1
+
+    if frame[: len(READ_PREFIX)] != READ_PREFIX:
+        raise FrameError("Frame is not a 2WL reply")
+    if _UPPER_HEX.search(frame, len(READ_PREFIX)):
+        frame = frame.lower()
+    view = memoryview(frame)
+    if not end or frame[end - 1] != _CLOSE:
+        raise FrameError("Frame is truncated")
+
+    pos = len(READ_PREFIX)
+    count = True
+    while True:
+        pos = _skip_spaces(frame, pos, end)
+        if frame[pos] != _QUOTE:
+            raise FrameError(f"Expected a string at offset {pos}")
+        close = frame.find(b'"', pos + 1, end)
+        if close < 0:
+            raise FrameError(f"Unterminated string at offset {pos}")
+        if count:
+            # The record count comes first, it is not a record
+            if not frame[pos + 1 : close].isdigit():
+                raise FrameError("Record count is not a number")
+            count = False
+        else:
+            yield view[pos + 1 : close]
+
+        pos = _skip_spaces(frame, close + 1, end)
+        if frame[pos] == _CLOSE:
+            if pos != end - 1:
+                raise FrameError(f"Unexpected data at offset {pos + 1}")
+            return
+        if frame[pos] != _COMMA:
+            raise FrameError(f"Expected a comma at offset {pos}")
+        pos += 1
+
+
+def record_signature(frame: bytes) -> tuple[bytes, ...]:
+    """Return the code and id of each record of a "2WL" reply.
+
+    The records a device sends, and their order, depend on its model and
+    configuration and stay the same between polls, so they tell whether a
+    reply comes from the expected device.
+    """
+    return tuple(bytes(record[:4]) for record in iter_records(frame))
@@ -0,0 +1,106 @@
+"""In-memory time series of decoded 4Heat readings."""
+
+from array import array
+from bisect import bisect_left
+from itertools import pairwise
+import statistics
+import time
+
+HISTORY_FIELDS = ("room_temperature", "target_temperature")
+
+
+class DeviceHistory:
+    """Fixed window of readings kept in preallocated arrays.
+
+    Appending writes one slot of each array, so it is O(1) and never allocates.
+    Queries copy the window they need, oldest first, and scan it once.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        """Initialise."""
+        self.capacity = capacity
+        self._timestamps = array("d", bytes(8 * capacity))
+        self._values = {
+            field: array("d", bytes(8 * capacity)) for field in HISTORY_FIELDS
+        }
+        self._states = array("i", bytes(4 * capacity))
+        self._index = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        """Return the number of readings held."""
+        return self._count
+
+    def append(
+        self,
+        timestamp: float,
+        room_temperature: float,
+        target_temperature: float,
+        state: int,
+    ) -> None:
+        """Add a reading, overwriting the oldest one when the window is full."""
+        index = self._index
+        self._timestamps[index] = timestamp
+        self._values["room_temperature"][index] = room_temperature
+        self._values["target_temperature"][index] = target_temperature
+        self._states[index] = state
+
+        self._index = (index + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+
+    def __ordered(self, data: array) -> array:
+        if self._count < self.capacity:
+            return data[: self._count]
+        return data[self._index :] + data[: self._index]
+
+    def __window(self, seconds: float | None) -> slice:
+        if seconds is None:
+            return slice(None)
+        timestamps = self.__ordered(self._timestamps)
+        return slice(bisect_left(timestamps, time.time() - seconds), None)
+
+    def statistics(self, field: str, seconds: float | None = None) -> dict[str, float]:
+        """Return min, max, mean and slope (per hour) of a field over the window."""
+        window = self.__window(seconds)
+        values = self.__ordered(self._values[field])[window]
+
+        if not values:
+            return {"min": None, "max": None, "mean": None, "slope": None}
+
+        return {
+            "min": min(values),
+            "max": max(values),
+            "mean": statistics.fmean(values),
+            "slope": self.__slope(self.__ordered(self._timestamps)[window], values),
+        }
+
+    def slope(self, field: str, seconds: float | None = None) -> float | None:
+        """Return the least squares slope of a field, in units per hour."""
+        window = self.__window(seconds)
+        return self.__slope(
+            self.__ordered(self._timestamps)[window],
+            self.__ordered(self._values[field])[window],
+        )
+
+    @staticmethod
+    def __slope(timestamps: array, values: array) -> float | None:
+        if len(values) < 2 or timestamps[-1] == timestamps[0]:
+            return None
+        hours = [(timestamp - timestamps[0]) / 3600 for timestamp in timestamps]
+        return statistics.linear_regression(hours, values).slope
+
+    def time_in_state(self, seconds: float | None = None) -> dict[int, float]:
+        """Return the seconds spent in each state over the window.
+
+        Each interval between two readings is attributed to the state of the
+        first one.
+        """
+        window = self.__window(seconds)
+        timestamps = self.__ordered(self._timestamps)[window]
+        states = self.__ordered(self._states)[window]
+
+        totals: dict[int, float] = {}
+        for state, (start, end) in zip(states, pairwise(timestamps), strict=False):
+            totals[state] = totals.get(state, 0.0) + end - start
+        return dict(sorted(totals.items()))
@@ -0,0 +1,95 @@
+"""Journal of commands that could not be delivered to a 4Heat device."""
+
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 1
+
+COMMAND_POWER = "power"
+COMMAND_TEMPERATURE = "temperature"
+COMMAND_POWER_LEVEL = "power_level"
+# Followed by the zone id, each zone has its own pending setpoint
+COMMAND_ZONE_TEMPERATURE = "zone_temperature"
+
+# Parameter writes are delivered right away and never queued
+COMMAND_PARAMETERS = "parameters"
+
+# Power first, so a replayed setpoint reaches a stove that is already on
+REPLAY_ORDER = (
+    COMMAND_POWER,
+    COMMAND_POWER_LEVEL,
+    COMMAND_TEMPERATURE,
+    COMMAND_ZONE_TEMPERATURE,
+)
+
+
+def zone_command(zone: int) -> str:
+    """Return the kind of the setpoint command of a thermostat zone."""
+    return f"{COMMAND_ZONE_TEMPERATURE}_{zone}"
+
+
+def _replay_rank(kind: str) -> tuple[int, str]:
+    for rank, prefix in enumerate(REPLAY_ORDER):
+        if kind == prefix or kind.startswith(f"{prefix}_"):
+            return rank, kind
+    return len(REPLAY_ORDER), kind
+
+
+class CommandJournal:
+    """Pending commands of a device, persisted across restarts.
+
+    There is at most one pending command of each kind: a new command replaces
+    the pending one, so only the latest intent is replayed. Commands older than
+    the expiry are dropped.
+    """
+
+    def __init__(self, hass: HomeAssistant, code: str, expiry: float) -> None:
+        """Initialise."""
+        self.expiry = expiry
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{code}.commands")
+        self._commands: dict[str, dict[str, Any]] = {}
+
+    async def async_load(self) -> None:
+        """Load the pending commands saved before a restart."""
+        self._commands = await self._store.async_load() or {}
+        self.__expire()
+
+    def __save(self) -> None:
+        self._store.async_delay_save(lambda: self._commands, SAVE_DELAY)
+
+    def __expire(self) -> None:
+        limit = time.time() - self.expiry
+        expired = [
+            kind
+            for kind, command in self._commands.items()
+            if command["created"] < limit
+        ]
+        for kind in expired:
+            del self._commands[kind]
+        if expired:
+            self.__save()
+
+    def add(self, kind: str, value: Any) -> None:
+        """Queue a command, replacing any pending command of the same kind."""
+        self._commands[kind] = {"value": value, "created": time.time()}
+        self.__save()
+
+    def remove(self, kind: str) -> None:
+        """Drop the pending command of a kind, if any."""
+        if self._commands.pop(kind, None) is not None:
+            self.__save()
+
+    @property
+    def pending(self) -> dict[str, Any]:
+        """Return the value of each pending command, in replay order."""
+        self.__expire()
+        return {
+            kind: self._commands[kind]["value"]
+            for kind in sorted(self._commands, key=_replay_rank)
+        }
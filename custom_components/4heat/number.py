@@ -0,0 +1,90 @@
+"""Number platform for 4Heat devices."""
+
+import logging
+
+from homeassistant.components.number import (
+    DEFAULT_MAX_VALUE,
+    DEFAULT_MIN_VALUE,
+    NumberEntity,
+    NumberMode,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .base import FourHeatBaseEntity
+from .const import DOMAIN
+from .coordinator import FourHeatDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+):
+    """Set up the Numbers."""
+    # This gets the data update coordinator from hass.data as specified in your __init__.py
+    coordinator: FourHeatDataUpdateCoordinator = hass.data[DOMAIN][
+        config_entry.entry_id
+    ].coordinator
+
+    numbers = []
+    # Only devices with a writable pw_all record get the entity, the others
+    # get a power level sensor
+    if coordinator.device.power_level_writable:
+        numbers.append(FourHeatPowerLevel(coordinator, "power_level"))
+
+    async_add_entities(numbers)
+
+
+class FourHeatPowerLevel(FourHeatBaseEntity, NumberEntity):
+    """Power level of the stove.
+
+    It is read from the pw_all record of the polled frame, within the range
+    of the record, and written through the command path of the coordinator.
+    """
+
+    _attr_mode = NumberMode.SLIDER
+    _attr_native_step = 1
+
+    @property
+    def available(self) -> bool:
+        """Return if the power level can be set from the last frame."""
+        return super().available and self.coordinator.device.power_level_writable
+
+    @property
+    def native_value(self) -> int | None:
+        """Return the current power level."""
+        return self.coordinator.device.power_level
+
+    @property
+    def native_min_value(self) -> float:
+        """Return the lowest power level."""
+        # Frames without a pw_all record make the entity unavailable
+        return self.coordinator.device.power.get("min", DEFAULT_MIN_VALUE)
+
+    @property
+    def native_max_value(self) -> float:
+        """Return the highest power level."""
+        return self.coordinator.device.power.get("max", DEFAULT_MAX_VALUE)
+
+    async def async_set_native_value(self, value: float) -> None:
+        """Set the power level."""
+        # Rejected right away, before the command is sent or queued
+        try:
+            self.coordinator.device.validate_power_level(int(value))
+        except ValueError as err:
+            raise ServiceValidationError(str(err)) from err
+
+        resp = await self.coordinator.async_set_power_level(int(value))
+        _LOGGER.debug("Response to set power level command: %s", str(resp))
+        await self.coordinator.async_refresh()
+
+    @property
+    def extra_state_attributes(self):
+        """Return the extra state attributes."""
+        # Built once per update and shared by all entities of the device
+        return self.coordinator.attributes
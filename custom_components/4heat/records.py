@@ -0,0 +1,86 @@
+"""Values of the records of a 4Heat frame that entities are made of."""
+
+from __future__ import annotations
+
+import binascii
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+import struct
+
+KIND_TEMPERATURE = "temperature"
+KIND_POWER = "power"
+
+# Byte offset of the number of decimals (pos_punto) of the main values record
+MAIN_VALUES_DECIMALS = 18
+
+# Record code, record name and its values: name, byte offset, format, kind and
+# byte offset of the number of decimals (pos_punto), when the record has one.
+# The name of the main values record is left out of the key, it is unique.
+RECORD_FIELDS: dict[
+    bytes, tuple[str, tuple[tuple[str, int, str, str, int | None], ...]]
+] = {
+    b"10": ("", (("temp_sec", 3, ">h", KIND_TEMPERATURE, MAIN_VALUES_DECIMALS),)),
+    b"02": ("th_temp", (("temperature", 3, ">h", KIND_TEMPERATURE, None),)),
+    b"22": ("th_all_2", (("temperature", 13, ">h", KIND_TEMPERATURE, 15),)),
+    b"06": ("pw_all", (("value", 2, "B", KIND_POWER, None),)),
+}
+
+
+@dataclass(frozen=True, slots=True)
+class RecordField:
+    """A value at a fixed position and offset of every frame of a device."""
+
+    key: str
+    position: int
+    record_id: int
+    kind: str
+    offset: int
+    decimals: int | None
+    unpacker: struct.Struct = field(compare=False)
+
+    def unpack(self, raw: bytes) -> int | float:
+        """Return the value from the binary record, scaled by its decimals."""
+        return scale(self.unpacker.unpack_from(raw, self.offset)[0], raw, self.decimals)
+
+
+def scale(value: int, raw: bytes, decimals: int | None) -> int | float:
+    """Return a value of a binary record, scaled by the decimals of the record.
+
+    Records too short to hold their decimals are not scaled.
+    """
+    if decimals is not None and len(raw) > decimals and (places := raw[decimals]):
+        return value / 10**places
+    return value
+
+
+def map_fields(records: Iterable[bytes | memoryview]) -> list[RecordField]:
+    """Return the values found in the lower case hex records of a frame.
+
+    Each value keeps the position of its record, so later frames only decode
+    the records entities are made of.
+    """
+    fields: list[RecordField] = []
+    keys = set()
+    for position, record in enumerate(records):
+        code = bytes(record[:2])
+        if code not in RECORD_FIELDS:
+            continue
+        name, values = RECORD_FIELDS[code]
+        raw = binascii.unhexlify(record)
+        for value, offset, fmt, kind, decimals in values:
+            key = f"{name}_{raw[1]}" if name else value
+            if key in keys or len(raw) < offset + struct.calcsize(fmt):
+                continue
+            keys.add(key)
+            fields.append(
+                RecordField(
+                    key=key,
+                    position=position,
+                    record_id=raw[1],
+                    kind=kind,
+                    offset=offset,
+                    decimals=decimals,
+                    unpacker=struct.Struct(fmt),
+                )
+            )
+    return fields
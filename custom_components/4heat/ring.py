@@ -0,0 +1,90 @@
+"""Fixed-size ring buffer of raw frames for 4Heat diagnostics."""
+
+from datetime import datetime
+from typing import Any
+
+DECODED_FIELDS = ("state", "error_code", "room_temperature", "target_temperature")
+
+
+class FrameRecord:
+    """A single raw frame exchanged with the device and how it was handled."""
+
+    __slots__ = (
+        "decision",
+        "decoded",
+        "duration",
+        "error",
+        "raw",
+        "timestamp",
+        "transport",
+    )
+
+    def __init__(self) -> None:
+        """Initialise an empty slot."""
+        self.timestamp: datetime = None
+        self.transport: str = None
+        self.decision: str = None
+        self.raw: Any = None
+        self.decoded: tuple = None
+        self.duration: float = 0.0
+        self.error: str = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize."""
+        return {
+            "timestamp": self.timestamp,
+            "transport": self.transport,
+            "decision": self.decision,
+            "duration": round(self.duration, 3),
+            "error": self.error,
+            "decoded": dict(zip(DECODED_FIELDS, self.decoded, strict=True))
+            if self.decoded
+            else None,
+            # Local frames are kept as received and only decoded for a dump
+            "raw": self.raw.decode(errors="replace")
+            if isinstance(self.raw, bytes)
+            else self.raw,
+        }
+
+
+class FrameRingBuffer:
+    """Keep the last N frames in preallocated slots.
+
+    Recording only overwrites the fields of an existing slot, so the cost per
+    poll is constant and nothing is formatted until a dump is requested.
+    """
+
+    def __init__(self, size: int) -> None:
+        """Initialise."""
+        self._slots = [FrameRecord() for _ in range(size)]
+        self._index = 0
+        self._count = 0
+
+    def record(
+        self,
+        transport: str,
+        decision: str,
+        raw: Any,
+        decoded: tuple | None,
+        duration: float,
+        error: Exception | None = None,
+    ) -> None:
+        """Store a frame, overwriting the oldest one when the buffer is full."""
+        slot = self._slots[self._index]
+        slot.timestamp = datetime.now()
+        slot.transport = transport
+        slot.decision = decision
+        slot.raw = raw
+        slot.decoded = decoded
+        slot.duration = duration
+        slot.error = repr(error) if error is not None else None
+
+        self._index = (self._index + 1) % len(self._slots)
+        if self._count < len(self._slots):
+            self._count += 1
+
+    def as_list(self) -> list[dict[str, Any]]:
+        """Return the recorded frames, oldest first."""
+        size = len(self._slots)
+        start = (self._index - self._count) % size
+        return [self._slots[(start + i) % size].to_dict() for i in range(self._count)]
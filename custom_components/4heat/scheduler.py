@@ -0,0 +1,93 @@
+"""Per-device scheduling of requests to a 4Heat device."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+import heapq
+import itertools
+from typing import TypeVar
+
+PRIORITY_COMMAND = 0
+PRIORITY_POLL = 1
+
+_T = TypeVar("_T")
+
+
+class DeviceScheduler:
+    """Give one request at a time access to a device.
+
+    Waiting requests are served by priority, so a user command queued behind
+    a poll runs before any other poll, and in arrival order within the same
+    priority. Concurrent reads share the read already in flight.
+    """
+
+    def __init__(self) -> None:
+        """Initialise."""
+        self._busy = False
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._read: asyncio.Future | None = None
+        self._readers = 0
+
+    def __release(self) -> None:
+        while self._waiters:
+            _, _, waiter = heapq.heappop(self._waiters)
+            if not waiter.done():
+                # Hand the device over directly, it stays busy
+                waiter.set_result(None)
+                return
+        self._busy = False
+
+    async def __acquire(self, priority: int) -> None:
+        if not self._busy and not self._waiters:
+            self._busy = True
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), waiter))
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The device was handed over just before the cancellation
+                self.__release()
+            raise
+
+    @asynccontextmanager
+    async def slot(self, priority: int) -> AsyncIterator[None]:
+        """Hold the device for the duration of the block."""
+        await self.__acquire(priority)
+        try:
+            yield
+        finally:
+            self.__release()
+
+    async def __shared_read(self, fetch: Callable[[], Awaitable[_T]]) -> _T:
+        try:
+            async with self.slot(PRIORITY_POLL):
+                return await fetch()
+        finally:
+            # A cancelled read may already have been replaced by a new one
+            if self._read is asyncio.current_task():
+                self._read = None
+
+    async def read(self, fetch: Callable[[], Awaitable[_T]]) -> _T:
+        """Run a read at poll priority, or join the one already in flight.
+
+        A cancelled caller does not cancel the read of the others, but the
+        read is cancelled once all its callers are, e.g. when their deadlines
+        ran out, so it does not hold the device any longer.
+        """
+        if self._read is None:
+            self._read = asyncio.ensure_future(self.__shared_read(fetch))
+        read = self._read
+        self._readers += 1
+        try:
+            return await asyncio.shield(read)
+        finally:
+            self._readers -= 1
+            if not self._readers and not read.done():
+                read.cancel()
+                self._read = None
@@ -11,17 +11,29 @@ if you so wish, or mix and match to suit.
 """
 
 from dataclasses import dataclass
+from datetime import datetime
 import logging
+import time
 
-from homeassistant.components.sensor import SensorDeviceClass, SensorEntity
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import UnitOfTemperature
-from homeassistant.core import HomeAssistant
+from homeassistant.const import (
+    PERCENTAGE,
+    EntityCategory,
+    UnitOfTemperature,
+    UnitOfTime,
+)
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .base import FourHeatBaseEntity
 from .const import DOMAIN
 from .coordinator import FourHeatDataUpdateCoordinator
+from .records import KIND_TEMPERATURE
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -56,6 +68,12 @@ async def async_setup_entry(
     sensor_types = [
         SensorTypeClass("room_temperature", FourHeatTemperatureSensor),
         SensorTypeClass("target_temperature", FourHeatTemperatureSensor),
+        SensorTypeClass("duty_cycle", FourHeatDutyCycleSensor),
+        SensorTypeClass("heat_up_rate", FourHeatHeatUpRateSensor),
+        SensorTypeClass("last_ignition_duration", FourHeatDurationSensor),
+        SensorTypeClass("on_time", FourHeatOnTimeSensor),
+        SensorTypeClass("last_update", FourHeatTimestampSensor),
+        SensorTypeClass("state_timestamp", FourHeatTimestampSensor),
     ]
 
     sensors = []
@@ -63,6 +81,20 @@ async def async_setup_entry(
     for sensor_type in sensor_types:
         sensors.extend([sensor_type.sensor_class(coordinator, sensor_type.type)])
 
+    # A power level only reported by the state_info_81 record gets a sensor,
+    # a pw_all record already gets one generated below
+    if coordinator.device.power_level is not None and not coordinator.device.power:
+        sensors.append(FourHeatPowerLevelSensor(coordinator, "power_level"))
+
+    # Probes, thermostats and power levels found in the frames of the device
+    for record_field in coordinator.loader.fields or []:
+        sensor_class = (
+            FourHeatRecordTemperatureSensor
+            if record_field.kind == KIND_TEMPERATURE
+            else FourHeatRecordSensor
+        )
+        sensors.append(sensor_class(coordinator, record_field.key))
+
     # Now create the sensors.
     async_add_entities(sensors)
 
@@ -74,8 +106,19 @@ class FourHeatBaseSensor(FourHeatBaseEntity, SensorEntity):
     See base.py for this class.
 
     https://developers.home-assistant.io/docs/core/entity/sensor
+
+    To limit recorder writes, a new state is only written when the value moved
+    by at least the deadband of the sensor and the minimum write interval has
+    passed since the last write. Availability changes are always written.
     """
 
+    _deadband: float = 0.0
+    # Option holding the deadband, the parameter of the sensor by default
+    _deadband_key: str | None = None
+    _written_value = None
+    _written_available: bool | None = None
+    _written_at: float = 0.0
+
     @property
     def native_value(self) -> int | float:
         """Return the state of the entity."""
@@ -83,6 +126,36 @@ class FourHeatBaseSensor(FourHeatBaseEntity, SensorEntity):
         # in Lovelace and HA will automatically calculate the correct value.
         return getattr(self.coordinator.device, self.parameter)
 
+    def _is_significant(self, value) -> bool:
+        """Return if the value differs enough from the last written one."""
+        if self.available != self._written_available:
+            return True
+
+        if time.monotonic() - self._written_at < self.coordinator.min_write_interval:
+            return False
+
+        previous = self._written_value
+        if isinstance(value, int | float) and isinstance(previous, int | float):
+            deadband = self.coordinator.deadbands.get(
+                self._deadband_key or self.parameter, self._deadband
+            )
+            if deadband:
+                return abs(value - previous) >= deadband
+
+        return value != previous
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Update sensor with latest data from coordinator."""
+        value = self.native_value
+        if not self._is_significant(value):
+            return
+
+        self._written_value = value
+        self._written_available = self.available
+        self._written_at = time.monotonic()
+        super()._handle_coordinator_update()
+
 
 class FourHeatTemperatureSensor(FourHeatBaseSensor):
     """Class to handle temperature sensors.
@@ -94,3 +167,94 @@ class FourHeatTemperatureSensor(FourHeatBaseSensor):
     _attr_device_class = SensorDeviceClass.TEMPERATURE
     _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
     _attr_suggested_display_precision = 1
+
+
+class FourHeatRecordSensor(FourHeatBaseSensor):
+    """Class to handle sensors generated from the records of the frame."""
+
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    @property
+    def native_value(self) -> int | float | None:
+        """Return the state of the entity."""
+        return self.coordinator.device.values.get(self.parameter)
+
+
+class FourHeatRecordTemperatureSensor(FourHeatRecordSensor):
+    """Temperature of a probe or thermostat found in the frame."""
+
+    _deadband_key = "room_temperature"
+    _attr_device_class = SensorDeviceClass.TEMPERATURE
+    _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
+    _attr_suggested_display_precision = 1
+
+
+class FourHeatPowerLevelSensor(FourHeatBaseSensor):
+    """Power level of a stove without a pw_all record."""
+
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+
+class FourHeatStatisticSensor(FourHeatBaseSensor):
+    """Class to handle sensors of the streaming statistics of the coordinator."""
+
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    @property
+    def native_value(self) -> int | float | None:
+        """Return the state of the entity."""
+        return getattr(self.coordinator.statistics, self.parameter)
+
+
+class FourHeatDutyCycleSensor(FourHeatStatisticSensor):
+    """Share of time the stove was on, weighted towards the last 24 hours."""
+
+    _deadband = 1.0
+    _attr_native_unit_of_measurement = PERCENTAGE
+    _attr_suggested_display_precision = 0
+
+
+class FourHeatHeatUpRateSensor(FourHeatStatisticSensor):
+    """Smoothed rate of change of the room temperature."""
+
+    _deadband = 0.5
+    _attr_native_unit_of_measurement = f"{UnitOfTemperature.CELSIUS}/h"
+    _attr_suggested_display_precision = 1
+
+
+class FourHeatDurationSensor(FourHeatStatisticSensor):
+    """Duration of the last successful ignition."""
+
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.SECONDS
+    _attr_suggested_display_precision = 0
+
+
+class FourHeatOnTimeSensor(FourHeatDurationSensor):
+    """Time the stove has been on since the integration was loaded."""
+
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _attr_suggested_unit_of_measurement = UnitOfTime.HOURS
+    _attr_suggested_display_precision = 1
+    _deadband = 60.0
+
+
+class FourHeatTimestampSensor(FourHeatBaseSensor):
+    """Diagnostic timestamps of the device data.
+
+    These change on every poll, so they are kept out of the attributes of the
+    other entities and are disabled by default.
+    """
+
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    @property
+    def native_value(self) -> datetime | None:
+        """Return the state of the entity."""
+        value: datetime = getattr(self.coordinator.device, self.parameter)
+        if value is None or value.tzinfo is not None:
+            return value
+        # Device timestamps are naive local times
+        return value.astimezone()
@@ -0,0 +1,140 @@
+"""Services for the 4Heat integration."""
+
+from __future__ import annotations
+
+import voluptuous as vol
+
+from homeassistant.const import ATTR_CONFIG_ENTRY_ID
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+import homeassistant.helpers.config_validation as cv
+
+from .api import APIAuthError, APIConnectionError
+from .const import (
+    DOMAIN,
+    HISTORY_SERVICE_NAME,
+    RESPONSE_SERVICE_NAME,
+    SET_PARAMETERS_SERVICE_NAME,
+)
+from .coordinator import FourHeatDataUpdateCoordinator
+from .history import HISTORY_FIELDS
+from .tiers import TIER_PARAMETERS
+
+ATTR_WINDOW = "window"
+ATTR_PARAMETERS = "parameters"
+
+HISTORY_SERVICE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_WINDOW, default=60): vol.All(
+            vol.Coerce(int), vol.Range(min=1)
+        ),
+    }
+)
+
+
+PARAMETERS_SERVICE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+    }
+)
+
+SET_PARAMETERS_SERVICE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(ATTR_PARAMETERS): vol.All(
+            {vol.Coerce(int): vol.Coerce(float)}, vol.Length(min=1)
+        ),
+    }
+)
+
+
+class FourHeatServicesSetup:
+    """Class to handle Integration Services.
+
+    Services are registered once for the domain and find the device they act
+    on from the config entry given in the service call.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialise services."""
+        self.hass = hass
+        self.setup_services()
+
+    def setup_services(self):
+        """Initialise the services."""
+        self.hass.services.async_register(
+            DOMAIN,
+            HISTORY_SERVICE_NAME,
+            self.async_history_service,
+            schema=HISTORY_SERVICE_SCHEMA,
+            supports_response=SupportsResponse.ONLY,
+        )
+        self.hass.services.async_register(
+            DOMAIN,
+            RESPONSE_SERVICE_NAME,
+            self.async_parameters_service,
+            schema=PARAMETERS_SERVICE_SCHEMA,
+            supports_response=SupportsResponse.ONLY,
+        )
+        self.hass.services.async_register(
+            DOMAIN,
+            SET_PARAMETERS_SERVICE_NAME,
+            self.async_set_parameters_service,
+            schema=SET_PARAMETERS_SERVICE_SCHEMA,
+            supports_response=SupportsResponse.OPTIONAL,
+        )
+
+    def _get_coordinator(self, call: ServiceCall) -> FourHeatDataUpdateCoordinator:
+        """Return the coordinator of the config entry in the service call."""
+        runtime_data = self.hass.data.get(DOMAIN, {}).get(
+            call.data[ATTR_CONFIG_ENTRY_ID]
+        )
+        if runtime_data is None:
+            raise ServiceValidationError(
+                f"No loaded 4Heat device for entry {call.data[ATTR_CONFIG_ENTRY_ID]}"
+            )
+        return runtime_data.coordinator
+
+    async def async_history_service(self, call: ServiceCall) -> ServiceResponse:
+        """Return statistics of the readings kept in memory."""
+        history = self._get_coordinator(call).history
+        seconds = call.data[ATTR_WINDOW] * 60
+
+        return {
+            "samples": len(history),
+            **{field: history.statistics(field, seconds) for field in HISTORY_FIELDS},
+            "time_in_state": {
+                str(state): duration
+                for state, duration in history.time_in_state(seconds).items()
+            },
+        }
+
+    async def async_parameters_service(self, call: ServiceCall) -> ServiceResponse:
+        """Return the parameter table of the last frame, without polling."""
+        coordinator = self._get_coordinator(call)
+        device = coordinator.device
+
+        return {
+            "last_update": device.last_update.isoformat()
+            if device.last_update
+            else None,
+            "refresh_in": coordinator.tiers.as_dict().get(TIER_PARAMETERS),
+            **device.parameter_table(),
+        }
+
+    async def async_set_parameters_service(self, call: ServiceCall) -> ServiceResponse:
+        """Write parameters and return the values read back."""
+        coordinator = self._get_coordinator(call)
+
+        try:
+            return await coordinator.async_set_parameters(call.data[ATTR_PARAMETERS])
+        except ValueError as err:
+            raise ServiceValidationError(str(err)) from err
+        except (APIAuthError, APIConnectionError, TimeoutError) as err:
+            raise HomeAssistantError(f"Parameters not written: {err}") from err
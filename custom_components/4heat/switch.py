@@ -80,13 +80,5 @@ class FourHeatSwitch(FourHeatBaseEntity, SwitchEntity):
     @property
     def extra_state_attributes(self):
         """Return the extra state attributes."""
-        # Add any additional attributes you want on your sensor.
-        attrs = {}
-        attrs["is_connected"] = self.coordinator.device.is_connected
-        attrs["state_code"] = self.coordinator.device.state
-        attrs["state_desc"] = self.coordinator.device.state_description
-        attrs["state_timestamp"] = self.coordinator.device.state_timestamp.isoformat()
-        attrs["last_update"] = self.coordinator.device.last_update.isoformat()
-        attrs["error_code"] = self.coordinator.device.error_code
-        attrs["error"] = self.coordinator.device.error_description
-        return attrs
+        # Built once per update and shared by all entities of the device
+        return self.coordinator.attributes
@@ -2,56 +2,56 @@
 
 import asyncio
 import logging
-import socket
 
 from .const import (
     COMMAND_READ_DATA,
     COMMAND_SET_TEMPERATURE,
     COMMAND_TURN_OFF,
     COMMAND_TURN_ON,
+    TCP_TIMEOUT,
 )
-from .device import Device
+from .device import Device, write_command
+from .scheduler import PRIORITY_COMMAND, DeviceScheduler
 
 _LOGGER = logging.getLogger(__name__)
 
 
 class TCPCommunication:
-    """Class for TCP communication with 4Heat device."""
+    """Class for TCP communication with 4Heat device.
 
-    def __init__(self, ip: str, port: int) -> None:
+    Devices handle concurrent connections badly, so requests go through a
+    scheduler: one connection at a time, commands before polls, and a single
+    read shared by concurrent readers.
+    """
+
+    def __init__(self, ip: str, port: int, timeout: float = TCP_TIMEOUT) -> None:
         """Initialise."""
         self.ip = ip
         self.port = port
+        self.timeout = timeout
+        self.scheduler = DeviceScheduler()
 
-    async def __receive_data(self, sock) -> str:
-        """Receive data from the socket."""
-        data_str: str
-        try:
-            loop = asyncio.get_event_loop()
-            received_data = await loop.run_in_executor(None, sock.recv, 1024)
-
-            if received_data:
-                data_str = received_data.decode()
-        finally:
-            sock.close()
-
-        return data_str
+    async def __send_command(self, command: str) -> bytes:
+        """Send a command to the specified IP address and port.
 
-    async def __send_command(self, command: str) -> str:
-        """Send a command to the specified IP address and port."""
+        Uses non-blocking streams, so a request cancelled by its caller's
+        deadline closes the connection right away.
+        """
 
+        writer = None
         try:
             _LOGGER.debug("Sending %s to %s", command, self.ip)
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(None, sock.connect, (self.ip, self.port))
+            async with asyncio.timeout(self.timeout):
+                reader, writer = await asyncio.open_connection(self.ip, self.port)
 
-            data_to_send = command.encode()
-            await asyncio.sleep(0.5)  # Simulate delay
-            await loop.run_in_executor(None, sock.sendall, data_to_send)
+                await asyncio.sleep(0.5)  # Simulate delay
+                writer.write(command.encode())
+                await writer.drain()
 
-            response = await self.__receive_data(sock)
-            _LOGGER.debug("Received '%s' from device", response)
+                received_data = await reader.read(1024)
+
+            if not received_data:
+                raise TCPCommunicationError("No data received from device")
         except ConnectionRefusedError as e:
             _LOGGER.error("Connection refused to %s:%s", self.ip, str(self.port))
             _LOGGER.error(e)
@@ -61,26 +61,35 @@ class TCPCommunication:
             _LOGGER.error(e)
             raise TCPCommunicationError from e
         finally:
-            sock.close()
+            if writer is not None:
+                writer.close()
 
-        return response
+        return received_data
 
-    async def read_data(self) -> str:
-        """Send power off command to the device."""
+    async def __send_user_command(self, command: str) -> bytes:
+        """Send a command ahead of any queued poll."""
+        async with self.scheduler.slot(PRIORITY_COMMAND):
+            return await self.__send_command(command)
+
+    async def read_data(self) -> bytes:
+        """Read the device data, joining a read already in flight.
+
+        The reply is returned as received, for the decoder to parse in place.
+        """
         command = COMMAND_READ_DATA
-        return await self.__send_command(command)
+        return await self.scheduler.read(lambda: self.__send_command(command))
 
-    async def turn_on(self) -> str:
+    async def turn_on(self) -> bytes:
         """Send power on command to the device."""
         command = COMMAND_TURN_ON
-        return await self.__send_command(command)
+        return await self.__send_user_command(command)
 
-    async def turn_off(self) -> str:
+    async def turn_off(self) -> bytes:
         """Send power off command to the device."""
         command = COMMAND_TURN_OFF
-        return await self.__send_command(command)
+        return await self.__send_user_command(command)
 
-    async def set_temperature(self, device: Device, temperature: int) -> str:
+    async def set_temperature(self, device: Device, temperature: int) -> bytes:
         """Send set temperature command to the device."""
         temp_hex = hex(temperature)[2:]
 
@@ -93,9 +102,31 @@ class TCPCommunication:
         else:
             raise TCPCommunication("Target temperature is invalid")
 
-        command = f'{COMMAND_SET_TEMPERATURE}{temp_hex}{device.set_temperature_command}"]'
-
-        return await self.__send_command(command)
+        command = (
+            f'{COMMAND_SET_TEMPERATURE}{temp_hex}{device.set_temperature_command}"]'
+        )
+
+        return await self.__send_user_command(command)
+
+    async def set_zone_temperature(
+        self, device: Device, zone: int, temperature: int
+    ) -> bytes:
+        """Send set temperature command to a thermostat zone of the device."""
+        _LOGGER.debug("Trying to set zone %s temperature to %s", zone, temperature)
+        command = device.zone_temperature_command(zone, temperature)
+        return await self.__send_user_command(command)
+
+    async def set_power_level(self, device: Device, level: int) -> bytes:
+        """Send set power level command to the device."""
+        _LOGGER.debug("Trying to set power level to %s", level)
+        command = device.power_level_command(level)
+        return await self.__send_user_command(command)
+
+    async def write_records(self, records: list[str]) -> bytes:
+        """Send several record writes to the device in one connection."""
+        _LOGGER.debug("Trying to write %s records", len(records))
+        command = write_command(records)
+        return await self.__send_user_command(command)
 
 
 class TCPCommunicationError(Exception):
@@ -0,0 +1,58 @@
+"""Refresh tiers of the data of a 4Heat device."""
+
+import time
+
+# State, error and temperatures, refreshed on every poll
+TIER_HOT = "hot"
+# Parameter table of the device
+TIER_PARAMETERS = "parameters"
+# Name and firmware version, only known to the cloud
+TIER_IDENTITY = "identity"
+
+ALL_TIERS = frozenset({TIER_HOT, TIER_PARAMETERS, TIER_IDENTITY})
+
+
+class RefreshTiers:
+    """Keep track of which groups of data are due for a refresh.
+
+    The hot tier is always due. Every other tier is due once its interval has
+    passed since its last refresh, or after it was invalidated.
+    """
+
+    def __init__(self, intervals: dict[str, float]) -> None:
+        """Initialise."""
+        self.intervals = intervals
+        self._refreshed: dict[str, float] = {}
+
+    def due(self) -> frozenset[str]:
+        """Return the tiers to refresh now."""
+        now = time.monotonic()
+        return frozenset(
+            {TIER_HOT}
+            | {
+                tier
+                for tier, interval in self.intervals.items()
+                if tier not in self._refreshed
+                or now - self._refreshed[tier] >= interval
+            }
+        )
+
+    def done(self, tiers: frozenset[str]) -> None:
+        """Record that tiers were refreshed."""
+        now = time.monotonic()
+        for tier in tiers:
+            self._refreshed[tier] = now
+
+    def invalidate(self, tier: str) -> None:
+        """Make a tier due on the next poll, e.g. after a reconnect."""
+        self._refreshed.pop(tier, None)
+
+    def as_dict(self) -> dict[str, float | None]:
+        """Serialize, with the seconds until each tier is due."""
+        now = time.monotonic()
+        return {
+            tier: round(max(0.0, self._refreshed[tier] + interval - now), 1)
+            if tier in self._refreshed
+            else None
+            for tier, interval in self.intervals.items()
+        }
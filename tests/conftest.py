@@ -0,0 +1,215 @@
+"""Shared setup of the tests of the 4Heat integration.
+
+Most modules are tested without Home Assistant: they are imported with the
+loader of the command line tools, which skips the package __init__. Tests of
+the modules needing Home Assistant are skipped when it is not installed.
+"""
+
+import asyncio
+from importlib import import_module
+import json
+from pathlib import Path
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from tools.component import load  # noqa: E402
+
+MAIN_VALUES = "10000000000000050000000000dc000000000000"
+# Other records, so the thermostat lands at the default position of the loader
+FILLER = "020100d2000000"
+THERMOSTAT = "12005a0014000a002d00010001000000000000"
+
+
+@pytest.fixture
+def frame_records():
+    """Return a builder of the records of a frame.
+
+    The frame holds the main values and the main thermostat, followed by the
+    records under test.
+    """
+
+    def build(*records: str, main_values: str = MAIN_VALUES) -> list[str]:
+        return [main_values, *[FILLER] * 11, THERMOSTAT, *records]
+
+    return build
+
+
+@pytest.fixture
+def frame(frame_records):
+    """Return a builder of "2WL" replies holding the records under test."""
+
+    def build(*records: str, main_values: str = MAIN_VALUES) -> bytes:
+        values = frame_records(*records, main_values=main_values)
+        return json.dumps(["2WL", str(len(values)), *values]).encode()
+
+    return build
+
+
+@pytest.fixture
+def read_device(frame):
+    """Return a builder of devices decoded from a frame with the records."""
+    device_module = load("device")
+
+    def read(*records: str, main_values: str = MAIN_VALUES):
+        loader = device_module._DeviceLoader()
+        device = device_module.Device(loader)
+        loader.load_from_local(device, frame(*records, main_values=main_values))
+        return device
+
+    return read
+
+
+@pytest.fixture
+def cloud(frame_records):
+    """Return a builder of cloud replies holding the records under test."""
+
+    def build(*records: str, main_values: str = MAIN_VALUES) -> dict:
+        values = frame_records(*records, main_values=main_values)
+        return {
+            "Name": "Stove",
+            "ProductVersion": "01",
+            "FirmwareVersion": "2",
+            "FirmwareRevision": "3",
+            "IpAddress": "192.168.1.10",
+            "IsConnected": True,
+            "LastTimestamp": "2024-01-01T10:00:00",
+            "LastMessageReceived": json.dumps({"Values": values}),
+        }
+
+    return build
+
+
+class MemoryStore:
+    """Store keeping the saved data in memory, by key."""
+
+    def __init__(self, data: dict, key: str) -> None:
+        """Initialise."""
+        self._data = data
+        self.key = key
+        self.saves = 0
+
+    async def async_load(self):
+        """Return the saved data."""
+        return self._data.get(self.key)
+
+    async def async_save(self, data) -> None:
+        """Save the data."""
+        self._data[self.key] = dict(data)
+        self.saves += 1
+
+    def async_delay_save(self, data_func, delay=0) -> None:
+        """Save the data right away."""
+        self._data[self.key] = dict(data_func())
+        self.saves += 1
+
+
+@pytest.fixture
+def storage(monkeypatch) -> dict:
+    """Keep the data saved by the integration in memory and return it by key."""
+    pytest.importorskip("homeassistant")
+    data = {}
+    for name in ("address", "journal"):
+        module = import_module(f"custom_components.4heat.{name}")
+        monkeypatch.setattr(
+            module, "Store", lambda hass, version, key: MemoryStore(data, key)
+        )
+    return data
+
+
+class FakeHass:
+    """The parts of Home Assistant the coordinator uses."""
+
+    def __init__(self) -> None:
+        """Initialise."""
+        self.data = {}
+
+    def async_create_task(self, target, name=None, eager_start=True):
+        """Schedule a coroutine."""
+        return asyncio.ensure_future(target)
+
+    def async_create_background_task(self, target, name, eager_start=True):
+        """Schedule a coroutine."""
+        return asyncio.ensure_future(target)
+
+    async def async_add_executor_job(self, target, *args):
+        """Run a job right away."""
+        return target(*args)
+
+
+class FakeTCP:
+    """TCP client replying with the frame of the device at its address."""
+
+    frames: dict[str, bytes] = {}
+    reads: list[str] = []
+
+    def __init__(self, ip: str, port: int) -> None:
+        """Initialise."""
+        self.ip = ip
+        self.port = port
+
+    async def read_data(self) -> bytes:
+        """Return the frame of the device, or fail when there is none."""
+        FakeTCP.reads.append(self.ip)
+        await asyncio.sleep(0)
+        if self.ip not in FakeTCP.frames:
+            raise import_module("custom_components.4heat.tcp").TCPCommunicationError(
+                f"No device at {self.ip}"
+            )
+        return FakeTCP.frames[self.ip]
+
+
+class FakeDiscovery:
+    """Discovery finding the devices of FakeTCP.frames."""
+
+    async def probe(self, ip: str) -> bool:
+        """Return if a device answers at the address."""
+        return ip in FakeTCP.frames
+
+    async def async_discover(self, network: str, refresh: bool = False) -> list[str]:
+        """Return the addresses of all devices."""
+        return list(FakeTCP.frames)
+
+
+@pytest.fixture
+def network(monkeypatch) -> type[FakeTCP]:
+    """Return the devices on the network, FakeTCP.frames by address."""
+    monkeypatch.setattr(FakeTCP, "frames", {})
+    monkeypatch.setattr(FakeTCP, "reads", [])
+    return FakeTCP
+
+
+@pytest.fixture
+def make_coordinator(monkeypatch, storage, network):
+    """Return a builder of local only coordinators.
+
+    Frames are read from the network fixture instead of the network.
+    """
+    module = import_module("custom_components.4heat.coordinator")
+    const = import_module("custom_components.4heat.const")
+    monkeypatch.setattr(
+        module.DataUpdateCoordinator,
+        "__init__",
+        lambda self, *args, update_interval, **kwargs: setattr(
+            self, "update_interval", update_interval
+        ),
+    )
+    monkeypatch.setattr(module, "TCPCommunication", network)
+    hass = FakeHass()
+
+    def build(ip: str | None = "192.168.1.10", **options):
+        entry = SimpleNamespace(
+            data={"code": "code", "ip_address": ip},
+            options={const.CONF_LOCAL_ONLY: True, **options},
+            unique_id="code",
+        )
+        coordinator = module.FourHeatDataUpdateCoordinator(hass, entry)
+        coordinator.hass = hass
+        coordinator.discovery = FakeDiscovery()
+        coordinator.last_update_success = True
+        return coordinator
+
+    return build
@@ -0,0 +1,82 @@
+"""Test the address cache of 4Heat devices."""
+
+import asyncio
+from importlib import import_module
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+address = import_module("custom_components.4heat.address")
+
+KEY = "4heat.code.address"
+
+
+@pytest.fixture
+def clock(monkeypatch, storage):
+    """Return a settable clock used as the wall time of the cache."""
+    now = [1000.0]
+    monkeypatch.setattr(address.time, "time", lambda: now[0])
+    return now
+
+
+def test_empty(clock):
+    """Without a saved address nothing is cached."""
+    cache = address.AddressCache(None, "code", 60)
+    assert asyncio.run(cache.async_load()) is None
+    assert cache.expired
+
+
+def test_ttl(clock):
+    """An address is trusted until its TTL expires."""
+    cache = address.AddressCache(None, "code", 60)
+    cache.set("192.168.1.10")
+    assert cache.ip == "192.168.1.10"
+    clock[0] += 60
+    assert not cache.expired
+    clock[0] += 1
+    assert cache.expired
+    assert cache.ip == "192.168.1.10"
+
+
+def test_set_unchanged(clock, storage):
+    """A confirmed address is only saved again once expired."""
+    cache = address.AddressCache(None, "code", 60)
+    cache.set("192.168.1.10")
+    clock[0] += 30
+    cache.set("192.168.1.10")
+    assert cache._store.saves == 1
+
+    clock[0] += 31
+    cache.set("192.168.1.10")
+    assert cache._store.saves == 2
+    assert storage[KEY] == {"ip": "192.168.1.10", "resolved": 1061.0}
+
+
+def test_set_moved(clock, storage):
+    """A device found at a new address is saved right away."""
+    cache = address.AddressCache(None, "code", 60)
+    cache.set("192.168.1.10")
+    cache.set("192.168.1.11")
+    assert storage[KEY]["ip"] == "192.168.1.11"
+
+
+def test_invalidate(clock):
+    """An invalidated address expires but is kept."""
+    cache = address.AddressCache(None, "code", 60)
+    cache.set("192.168.1.10")
+    cache.invalidate()
+    assert cache.expired
+    assert cache.ip == "192.168.1.10"
+
+
+def test_replace_after_restart(clock):
+    """An address entered by the user is saved and loaded after a restart."""
+    cache = address.AddressCache(None, "code", 60)
+    cache.set("192.168.1.10")
+    asyncio.run(cache.async_replace("192.168.1.20"))
+
+    clock[0] += 30
+    restarted = address.AddressCache(None, "code", 60)
+    assert asyncio.run(restarted.async_load()) == "192.168.1.20"
+    assert not restarted.expired
@@ -0,0 +1,81 @@
+"""Test the streaming statistics of 4Heat devices."""
+
+import math
+
+import pytest
+
+from tools.component import load
+
+aggregates = load("aggregates")
+const = load("const")
+
+RUNNING = 7
+
+
+def test_first_reading():
+    """A single reading has no aggregates."""
+    statistics = aggregates.StreamingStatistics()
+    statistics.update(0, const.STATE_OFF, 20.0)
+    assert statistics.time_in_state == {}
+    assert statistics.on_time == 0.0
+    assert statistics.duty_cycle is None
+    assert statistics.heat_up_rate is None
+
+
+def test_time_in_state():
+    """Each interval is attributed to the previous state."""
+    statistics = aggregates.StreamingStatistics()
+    statistics.update(0, const.STATE_OFF, 20.0)
+    statistics.update(100, RUNNING, 20.0)
+    statistics.update(400, RUNNING, 20.0)
+    assert statistics.time_in_state == {const.STATE_OFF: 100.0, RUNNING: 300.0}
+    assert statistics.on_time == 300.0
+
+
+def test_duty_cycle():
+    """The duty cycle is an exponentially weighted share of the on time."""
+    statistics = aggregates.StreamingStatistics()
+    statistics.update(0, RUNNING, 20.0)
+    statistics.update(60, const.STATE_OFF, 20.0)
+    assert statistics.duty_cycle == 100.0
+
+    elapsed = const.DUTY_CYCLE_TIME_CONSTANT
+    statistics.update(60 + elapsed, const.STATE_OFF, 20.0)
+    assert statistics.duty_cycle == pytest.approx(100.0 * math.exp(-1))
+
+
+def test_heat_up_rate():
+    """The heat up rate is in degrees per hour."""
+    statistics = aggregates.StreamingStatistics()
+    statistics.update(0, RUNNING, 20.0)
+    statistics.update(1800, RUNNING, 21.0)
+    assert statistics.heat_up_rate == pytest.approx(2.0)
+
+
+def test_out_of_order_reading():
+    """A reading older than the previous one is not folded in."""
+    statistics = aggregates.StreamingStatistics()
+    statistics.update(100, RUNNING, 20.0)
+    statistics.update(50, RUNNING, 25.0)
+    assert statistics.time_in_state == {}
+    assert statistics.heat_up_rate is None
+
+
+def test_ignition_duration():
+    """The ignition lasts from its first state until the stove runs."""
+    statistics = aggregates.StreamingStatistics()
+    statistics.update(0, const.STATE_OFF, 20.0)
+    statistics.update(10, 1, 20.0)
+    statistics.update(70, 2, 20.0)
+    statistics.update(310, RUNNING, 20.0)
+    assert statistics.last_ignition_duration == 300
+
+
+def test_failed_ignition():
+    """An ignition ending with the stove off keeps the last duration."""
+    statistics = aggregates.StreamingStatistics()
+    statistics.update(0, 1, 20.0)
+    statistics.update(100, RUNNING, 20.0)
+    statistics.update(200, 1, 20.0)
+    statistics.update(500, const.STATE_OFF, 20.0)
+    assert statistics.last_ignition_duration == 100
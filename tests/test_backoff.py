@@ -0,0 +1,56 @@
+"""Test the retry backoff of 4Heat transports."""
+
+import pytest
+
+from tools.component import load
+
+backoff = load("backoff")
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Return a settable clock used as the monotonic time of the backoff."""
+    now = [100.0]
+    monkeypatch.setattr(backoff.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_bounds(clock):
+    """Each delay is between the base and three times the previous one."""
+    retry = backoff.DecorrelatedJitterBackoff(2, 1000)
+    previous = 0.0
+    for _ in range(20):
+        delay = retry.failed()
+        assert 2 <= delay <= max(2, previous * 3)
+        previous = delay
+    assert retry.failures == 20
+
+
+def test_cap(clock, monkeypatch):
+    """Delays never exceed the cap."""
+    monkeypatch.setattr(backoff.random, "uniform", lambda low, high: high)
+    retry = backoff.DecorrelatedJitterBackoff(2, 30)
+    assert [retry.failed() for _ in range(5)] == [2, 6, 18, 30, 30]
+
+
+def test_ready(clock):
+    """The transport is ready again once the delay has passed."""
+    retry = backoff.DecorrelatedJitterBackoff(5, 60)
+    assert retry.ready
+    delay = retry.failed()
+    assert not retry.ready
+    assert retry.as_dict()["retry_in"] == round(delay, 1)
+    clock[0] += delay
+    assert retry.ready
+    assert retry.as_dict()["retry_in"] == 0
+
+
+def test_succeeded(clock):
+    """A success resets the backoff."""
+    retry = backoff.DecorrelatedJitterBackoff(5, 60)
+    retry.failed()
+    retry.failed()
+    retry.succeeded()
+    assert retry.ready
+    assert retry.as_dict() == {"failures": 0, "delay": 0, "retry_in": 0}
+    assert retry.failed() <= 5
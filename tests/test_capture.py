@@ -0,0 +1,102 @@
+"""Test the binary capture of raw 4Heat frames."""
+
+import os
+
+import pytest
+
+from tools.component import load
+
+capture = load("capture")
+
+
+def test_round_trip(tmp_path):
+    """Recorded frames are read back in order."""
+    path = str(tmp_path / "captures" / "frames.bin")
+    recorder = capture.FrameRecorder(path, 1024, 2)
+    recorder.append(capture.TRANSPORT_LOCAL, b'["2WL","1"]', 1.5)
+    recorder.append(capture.TRANSPORT_CLOUD, b"{}", 2.5)
+    recorder.close()
+
+    assert list(capture.iter_frames(path)) == [
+        (1.5, capture.TRANSPORT_LOCAL, b'["2WL","1"]'),
+        (2.5, capture.TRANSPORT_CLOUD, b"{}"),
+    ]
+
+
+def test_append_after_reopen(tmp_path):
+    """A reopened capture file gets no second header."""
+    path = str(tmp_path / "frames.bin")
+    for timestamp in (1.0, 2.0):
+        recorder = capture.FrameRecorder(path, 1024, 2)
+        recorder.append(capture.TRANSPORT_LOCAL, b"frame", timestamp)
+        recorder.close()
+
+    assert [frame[0] for frame in capture.iter_frames(path)] == [1.0, 2.0]
+
+
+def test_rotation(tmp_path):
+    """Full files are rotated and only the configured backups are kept."""
+    path = str(tmp_path / "frames.bin")
+    # Room for the header and a single record of 20 bytes
+    recorder = capture.FrameRecorder(path, 6 + 13 + 20, 2)
+    for index in range(4):
+        recorder.append(capture.TRANSPORT_LOCAL, bytes([index]) * 20, index)
+    recorder.close()
+
+    assert [frame[0] for frame in capture.iter_frames(path)] == [3]
+    assert [frame[0] for frame in capture.iter_frames(f"{path}.1")] == [2]
+    assert [frame[0] for frame in capture.iter_frames(f"{path}.2")] == [1]
+    assert not os.path.exists(f"{path}.3")
+
+
+def test_rotation_without_backups(tmp_path):
+    """Without backups a full file is started over."""
+    path = str(tmp_path / "frames.bin")
+    recorder = capture.FrameRecorder(path, 6 + 13 + 20, 0)
+    for index in range(3):
+        recorder.append(capture.TRANSPORT_LOCAL, bytes([index]) * 20, index)
+    recorder.close()
+
+    assert [frame[0] for frame in capture.iter_frames(path)] == [2]
+    assert not os.path.exists(f"{path}.1")
+
+
+def test_oversized_frame(tmp_path):
+    """A frame larger than the file size is still written to an empty file."""
+    path = str(tmp_path / "frames.bin")
+    recorder = capture.FrameRecorder(path, 10, 1)
+    recorder.append(capture.TRANSPORT_LOCAL, b"x" * 100, 1.0)
+    recorder.close()
+
+    assert [frame[2] for frame in capture.iter_frames(path)] == [b"x" * 100]
+    assert not os.path.exists(f"{path}.1")
+
+
+def test_truncated_record(tmp_path):
+    """A truncated last record is skipped."""
+    path = str(tmp_path / "frames.bin")
+    recorder = capture.FrameRecorder(path, 1024, 1)
+    recorder.append(capture.TRANSPORT_LOCAL, b"complete", 1.0)
+    recorder.append(capture.TRANSPORT_LOCAL, b"truncated", 2.0)
+    recorder.close()
+    with open(path, "r+b") as file:
+        file.truncate(os.path.getsize(path) - 3)
+
+    assert [frame[2] for frame in capture.iter_frames(path)] == [b"complete"]
+
+
+def test_empty_file(tmp_path):
+    """An empty file has no frames."""
+    path = tmp_path / "frames.bin"
+    path.touch()
+
+    assert list(capture.iter_frames(str(path))) == []
+
+
+def test_bad_magic(tmp_path):
+    """Other files are rejected."""
+    path = tmp_path / "frames.bin"
+    path.write_bytes(b"JUNKJUNKJUNK")
+
+    with pytest.raises(capture.CaptureFormatError):
+        list(capture.iter_frames(str(path)))
@@ -0,0 +1,253 @@
+"""Test the polling of the coordinator of 4Heat devices."""
+
+import asyncio
+from datetime import timedelta
+from importlib import import_module
+import random
+import time
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from homeassistant.helpers.update_coordinator import UpdateFailed  # noqa: E402
+
+const = import_module("custom_components.4heat.const")
+
+ADDRESS_KEY = "4heat.code.address"
+
+
+def test_restart_moved_device(make_coordinator, storage, network, frame):
+    """After a restart the device is polled at the address it moved to."""
+    storage[ADDRESS_KEY] = {"ip": "192.168.1.20", "resolved": time.time()}
+    network.frames["192.168.1.20"] = frame()
+    coordinator = make_coordinator("192.168.1.10")
+
+    async def run():
+        await coordinator._async_setup()
+        return await coordinator.async_update_data()
+
+    device = asyncio.run(run())
+    assert network.reads == ["192.168.1.20"]
+    assert device.ip == "192.168.1.20"
+    assert storage[ADDRESS_KEY]["ip"] == "192.168.1.20"
+
+
+def test_first_start(make_coordinator, storage, network, frame):
+    """Without a cached address the configured one is polled and cached."""
+    network.frames["192.168.1.10"] = frame()
+    coordinator = make_coordinator("192.168.1.10")
+
+    async def run():
+        await coordinator._async_setup()
+        await coordinator.async_update_data()
+
+    asyncio.run(run())
+    assert network.reads == ["192.168.1.10"]
+    assert storage[ADDRESS_KEY]["ip"] == "192.168.1.10"
+
+
+def test_discover_moved_device(make_coordinator, storage, network, frame):
+    """A device answering at a new address with its records is followed."""
+    network.frames["192.168.1.10"] = frame()
+    coordinator = make_coordinator("192.168.1.10")
+
+    async def run():
+        await coordinator.async_update_data()
+        network.frames["192.168.1.30"] = network.frames.pop("192.168.1.10")
+        coordinator.tcp_client = None
+        coordinator.address.invalidate()
+        coordinator._refreshed_at = None
+        await coordinator.async_update_data()
+
+    asyncio.run(run())
+    assert coordinator.device.ip == "192.168.1.30"
+    assert storage[ADDRESS_KEY]["ip"] == "192.168.1.30"
+
+
+def test_discover_wrong_device(make_coordinator, storage, network, frame):
+    """A device answering with other records is not taken for this one."""
+    network.frames["192.168.1.10"] = frame()
+    coordinator = make_coordinator("192.168.1.10")
+
+    async def run():
+        await coordinator.async_update_data()
+        del network.frames["192.168.1.10"]
+        network.frames["192.168.1.30"] = frame("060104010500")
+        coordinator.tcp_client = None
+        coordinator.address.invalidate()
+        coordinator._refreshed_at = None
+        await coordinator.async_update_data()
+
+    asyncio.run(run())
+    assert coordinator.device.ip == "192.168.1.10"
+    assert storage[ADDRESS_KEY]["ip"] == "192.168.1.10"
+
+
+def test_discover_other_entry(make_coordinator, storage, network, frame):
+    """The address of another device set up is not taken for this one."""
+    network.frames["192.168.1.30"] = frame()
+    sibling = make_coordinator("192.168.1.30")
+    sibling.device.ip = "192.168.1.30"
+    coordinator = make_coordinator("192.168.1.10")
+    coordinator.hass.data["4heat"] = {"sibling": SimpleNamespace(coordinator=sibling)}
+
+    with pytest.raises(UpdateFailed):
+        asyncio.run(coordinator.async_update_data())
+    assert network.reads == ["192.168.1.10"]
+    assert ADDRESS_KEY not in storage
+
+
+def test_concurrent_updates(make_coordinator, network, frame):
+    """Concurrent updates share a single read of the device."""
+    network.frames["192.168.1.10"] = frame()
+    coordinator = make_coordinator("192.168.1.10")
+
+    async def run():
+        return await asyncio.gather(
+            coordinator.async_update_data(), coordinator.async_update_data()
+        )
+
+    assert asyncio.run(run()) == [coordinator.device, coordinator.device]
+    assert network.reads == ["192.168.1.10"]
+
+
+def test_fresh_update(make_coordinator, network, frame):
+    """An update right after a successful one returns the data as is."""
+    network.frames["192.168.1.10"] = frame()
+    coordinator = make_coordinator("192.168.1.10")
+
+    async def run():
+        await coordinator.async_update_data()
+        await coordinator.async_update_data()
+        coordinator._refreshed_at -= 60
+        await coordinator.async_update_data()
+
+    asyncio.run(run())
+    assert network.reads == ["192.168.1.10"] * 2
+
+
+def test_cancelled_update(make_coordinator, network, frame):
+    """A cancelled caller does not cancel the update of the others."""
+    network.frames["192.168.1.10"] = frame()
+    coordinator = make_coordinator("192.168.1.10")
+
+    async def run():
+        cancelled = asyncio.ensure_future(coordinator.async_update_data())
+        waiting = asyncio.ensure_future(coordinator.async_update_data())
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        return await waiting
+
+    assert asyncio.run(run()) is coordinator.device
+    assert network.reads == ["192.168.1.10"]
+    assert coordinator._refresh_task is None
+
+
+def test_startup_offset(make_coordinator, network, frame, monkeypatch):
+    """Setup does not wait, the poll after the first update is offset."""
+    monkeypatch.setattr(random, "uniform", lambda low, high: high)
+    network.frames["192.168.1.10"] = frame()
+    coordinator = make_coordinator("192.168.1.10")
+    first = timedelta(seconds=const.UPDATE_INTERVAL + const.STARTUP_JITTER)
+
+    async def run():
+        await asyncio.wait_for(coordinator._async_setup(), 1)
+        await coordinator.async_update_data()
+        assert coordinator.update_interval == first
+        coordinator._refreshed_at = None
+        await coordinator.async_update_data()
+
+    asyncio.run(run())
+    assert coordinator.update_interval == timedelta(seconds=const.UPDATE_INTERVAL)
+
+
+def outage(coordinator, network, age: float):
+    """Take the device off the network, its last data being age seconds old."""
+    network.frames.clear()
+    coordinator.tcp_client = None
+    coordinator._refreshed_at = None
+    coordinator._updated_at -= age
+
+
+def test_stale_within_window(make_coordinator, network, frame):
+    """During a short outage the last good data is served with its age."""
+    network.frames["192.168.1.10"] = frame()
+    coordinator = make_coordinator("192.168.1.10", **{const.CONF_STALE_WINDOW: 300})
+
+    async def run():
+        device = await coordinator.async_update_data()
+        outage(coordinator, network, 120)
+        assert await coordinator.async_update_data() is device
+
+    asyncio.run(run())
+    assert coordinator.data_age == 120
+
+
+def test_stale_after_window(make_coordinator, network, frame):
+    """Data older than the staleness window is not served."""
+    network.frames["192.168.1.10"] = frame()
+    coordinator = make_coordinator("192.168.1.10", **{const.CONF_STALE_WINDOW: 300})
+
+    async def run():
+        await coordinator.async_update_data()
+        outage(coordinator, network, 400)
+        await coordinator.async_update_data()
+
+    with pytest.raises(UpdateFailed):
+        asyncio.run(run())
+
+
+def test_stale_window_disabled(make_coordinator, network, frame):
+    """A staleness window of 0 never serves stale data."""
+    network.frames["192.168.1.10"] = frame()
+    coordinator = make_coordinator("192.168.1.10", **{const.CONF_STALE_WINDOW: 0})
+
+    async def run():
+        await coordinator.async_update_data()
+        outage(coordinator, network, 0)
+        await coordinator.async_update_data()
+
+    with pytest.raises(UpdateFailed):
+        asyncio.run(run())
+
+
+def test_shared_attributes(make_coordinator, network, frame, monkeypatch):
+    """Attributes are built once per update and shared by all entities."""
+    network.frames["192.168.1.10"] = frame()
+    coordinator = make_coordinator("192.168.1.10")
+    # No entity is added to Home Assistant, so none listens to the coordinator
+    monkeypatch.setattr(
+        import_module("custom_components.4heat.coordinator").DataUpdateCoordinator,
+        "async_update_listeners",
+        lambda self: None,
+        raising=False,
+    )
+    descriptions = []
+    device_class = type(coordinator.device)
+    description = device_class.state_description.fget
+    monkeypatch.setattr(
+        device_class,
+        "state_description",
+        property(lambda device: descriptions.append(1) or description(device)),
+    )
+    climate = import_module("custom_components.4heat.climate")
+    switch = import_module("custom_components.4heat.switch")
+    entities = [
+        climate.FourHeatClimate(coordinator, "lareira"),
+        switch.FourHeatSwitch(coordinator, "switch"),
+    ]
+
+    asyncio.run(coordinator.async_update_data())
+    coordinator.async_update_listeners()
+    attributes = [
+        entity.extra_state_attributes for _ in range(3) for entity in entities
+    ]
+
+    assert all(shared is coordinator.attributes for shared in attributes)
+    assert len(descriptions) == 1
+    assert coordinator.attributes["state_code"] == coordinator.device.state
+    assert coordinator.attributes["data_age"] == 0
+    with pytest.raises(TypeError):
+        coordinator.attributes["state_code"] = 0
@@ -0,0 +1,69 @@
+"""Test the deadline budgets of 4Heat requests."""
+
+import asyncio
+
+import pytest
+
+from tools.component import load
+
+deadline = load("deadline")
+
+
+def test_remaining(monkeypatch):
+    """The remaining time counts down and stops at zero."""
+    now = [100.0]
+    monkeypatch.setattr(deadline.time, "monotonic", lambda: now[0])
+    budget = deadline.Deadline(10)
+    assert budget.remaining() == 10
+    now[0] += 4
+    assert budget.remaining() == 6
+    now[0] += 20
+    assert budget.remaining() == 0
+
+
+def test_timeout_share():
+    """A step is cancelled at its share of the budget."""
+
+    async def run():
+        budget = deadline.Deadline(10)
+        async with budget.timeout(0.01):
+            await asyncio.sleep(1)
+
+    with pytest.raises(TimeoutError):
+        asyncio.run(run())
+
+
+def test_timeout_budget():
+    """A step is cancelled when the budget runs out before its share."""
+
+    async def run():
+        budget = deadline.Deadline(0.01)
+        async with budget.timeout(10):
+            await asyncio.sleep(1)
+
+    with pytest.raises(TimeoutError):
+        asyncio.run(run())
+
+
+def test_timeout_spent():
+    """A step started after the budget ran out is cancelled right away."""
+
+    async def run():
+        budget = deadline.Deadline(0)
+        async with budget.timeout():
+            await asyncio.sleep(1)
+
+    with pytest.raises(TimeoutError):
+        asyncio.run(run())
+
+
+def test_timeout_in_time():
+    """A step finishing within its share is not cancelled."""
+
+    async def run():
+        budget = deadline.Deadline(10)
+        async with budget.timeout(5):
+            await asyncio.sleep(0)
+        return budget.remaining()
+
+    assert 0 < asyncio.run(run()) <= 10
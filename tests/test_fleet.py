@@ -0,0 +1,93 @@
+"""Test the headless fleet poller."""
+
+import asyncio
+import io
+import json
+import sys
+
+import pytest
+
+from tools.component import load
+
+if sys.version_info < (3, 12):
+    pytest.skip("the cloud client needs Python 3.12", allow_module_level=True)
+
+fleet = pytest.importorskip("tools.fleet")
+
+
+@pytest.fixture
+def network(monkeypatch):
+    """Return the frames of the devices on the network, by address."""
+    frames = {}
+
+    class FakeTCP:
+        def __init__(self, ip, port):
+            self.ip = ip
+            self.port = port
+
+        async def read_data(self):
+            if self.ip not in frames:
+                raise fleet.TCPCommunicationError(f"No device at {self.ip}")
+            return frames[self.ip]
+
+    monkeypatch.setattr(fleet, "TCPCommunication", FakeTCP)
+    return frames
+
+
+def poll(configs, polls=1):
+    """Poll the devices and return the records written, by device code."""
+    output = io.StringIO()
+    poller = fleet.FleetPoller(
+        [fleet.FleetDevice(config) for config in configs], output, 0, 4, 0, 0
+    )
+    asyncio.run(poller.run(polls))
+    records = [json.loads(line) for line in output.getvalue().splitlines()]
+    return {record["code"]: record for record in records}, records
+
+
+def test_poll(network, frame, read_device):
+    """Devices read over TCP write their decoded values."""
+    network["192.168.1.10"] = frame()
+    records, _ = poll([{"code": "stove", "ip": "192.168.1.10"}])
+
+    record = records["stove"]
+    device = read_device()
+    assert record["ok"]
+    assert record["transport"] == "tcp"
+    assert record["ip"] == "192.168.1.10"
+    assert record["state"] == device.state
+    assert record["target_temperature"] == device.target_temperature
+
+
+def test_unreachable(network, frame):
+    """An unreachable device is reported without stopping the others."""
+    network["192.168.1.10"] = frame()
+    records, written = poll(
+        [
+            {"code": "stove", "ip": "192.168.1.10"},
+            {"code": "gone", "ip": "192.168.1.11"},
+        ],
+        polls=2,
+    )
+
+    assert len(written) == 4
+    assert records["stove"]["ok"]
+    assert not records["gone"]["ok"]
+    assert records["gone"]["failures"] == 2
+    assert "No device at 192.168.1.11" in records["gone"]["error"]
+
+
+def test_no_address(network):
+    """Devices without address nor credentials can not be polled."""
+    records, _ = poll([{"code": "stove"}])
+    assert not records["stove"]["ok"]
+    assert "No IP address or credentials for stove" in records["stove"]["error"]
+
+
+def test_file_map(network, frame, tmp_path):
+    """The file map is read from its path when the device is created."""
+    path = tmp_path / "map.json"
+    path.write_text(json.dumps({"comandi_term_princ": {"scritt_termostato": 13}}))
+    device = fleet.FleetDevice({"code": "stove", "file_map": str(path)})
+    assert device.file_map == {"comandi_term_princ": {"scritt_termostato": 13}}
+    assert isinstance(device.device, load("device").Device)
@@ -0,0 +1,71 @@
+"""Test the parser of 4Heat frames."""
+
+import pytest
+
+from tools.component import load
+
+frame = load("frame")
+
+
+def records(data: bytes) -> list[bytes]:
+    """Return the records of a frame as bytes."""
+    return [bytes(record) for record in frame.iter_records(data)]
+
+
+def test_records():
+    """The count is skipped and the records are yielded in order."""
+    assert records(b'["2WL","2","0a01","0b02"]') == [b"0a01", b"0b02"]
+
+
+def test_views():
+    """Records are views into the frame."""
+    record = next(frame.iter_records(b'["2WL","1","0a01"]'))
+    assert isinstance(record, memoryview)
+    assert record.obj == b'["2WL","1","0a01"]'
+
+
+def test_no_records():
+    """A frame may hold only the count."""
+    assert records(b'["2WL","0"]') == []
+
+
+def test_spaces():
+    """Spaces around the strings and trailing whitespace or NULs are allowed."""
+    data = b'["2WL", "2" ,\n "0a01",\t"0b02" ]\r\n\x00\x00'
+    assert records(data) == [b"0a01", b"0b02"]
+
+
+def test_lower_case():
+    """Records with upper case hex digits are yielded in lower case."""
+    assert records(b'["2WL","1","0A0B"]') == [b"0a0b"]
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b"",
+        b'["2WC","1","0a01"]',
+        b'["2wl","1","0a01"]',
+        b'["2WL","1","0a01"',
+        b'["2WL","1","0a01',
+        b'["2WL","x","0a01"]',
+        b'["2WL","","0a01"]',
+        b'["2WL",1,"0a01"]',
+        b'["2WL","1" "0a01"]',
+        b'["2WL","1","0a01"]]',
+        b'["2WL","1","0a01"],"0b02"]',
+        b'["2WL",]',
+        b'["2WL","1",]',
+    ],
+)
+def test_malformed(data):
+    """Malformed frames raise a frame error."""
+    with pytest.raises(frame.FrameError):
+        records(data)
+
+
+def test_record_signature():
+    """The signature holds the code and id of each record."""
+    signature = frame.record_signature(b'["2WL","2","0A01ff","0b02ee"]')
+    assert signature == (b"0a01", b"0b02")
+    assert frame.record_signature(b'["2WL","2","0a0100","0b0200"]') == signature
@@ -0,0 +1,73 @@
+"""Test the in-memory history of 4Heat readings."""
+
+import time
+
+import pytest
+
+from tools.component import load
+
+history = load("history")
+
+
+def filled(capacity, readings):
+    """Return a history holding the readings."""
+    result = history.DeviceHistory(capacity)
+    for reading in readings:
+        result.append(*reading)
+    return result
+
+
+def test_empty():
+    """An empty history has no statistics."""
+    empty = history.DeviceHistory(4)
+    assert len(empty) == 0
+    assert empty.statistics("room_temperature") == {
+        "min": None,
+        "max": None,
+        "mean": None,
+        "slope": None,
+    }
+    assert empty.slope("room_temperature") is None
+    assert empty.time_in_state() == {}
+
+
+def test_statistics():
+    """Minimum, maximum, mean and slope per hour are returned."""
+    readings = filled(4, [(0, 20.0, 22, 2), (1800, 21.0, 22, 2), (3600, 22.0, 22, 2)])
+    statistics = readings.statistics("room_temperature")
+    assert statistics["min"] == 20.0
+    assert statistics["max"] == 22.0
+    assert statistics["mean"] == 21.0
+    assert statistics["slope"] == pytest.approx(2.0)
+
+
+def test_wrap_around():
+    """The oldest readings are overwritten once the history is full."""
+    readings = filled(3, [(index * 3600, float(index), 22, 2) for index in range(5)])
+    assert len(readings) == 3
+    statistics = readings.statistics("room_temperature")
+    assert (statistics["min"], statistics["max"]) == (2.0, 4.0)
+    assert statistics["slope"] == pytest.approx(1.0)
+
+
+def test_window():
+    """Only the readings of the last seconds are used."""
+    now = time.time()
+    readings = filled(4, [(now - 7200, 10.0, 22, 2), (now - 60, 20.0, 22, 2)])
+    assert readings.statistics("room_temperature", 3600)["min"] == 20.0
+    assert readings.statistics("room_temperature", 1)["min"] is None
+
+
+def test_slope_needs_two_times():
+    """The slope needs readings at two different times."""
+    assert filled(4, [(0, 20.0, 22, 2)]).slope("room_temperature") is None
+    readings = filled(4, [(0, 20.0, 22, 2), (0, 21.0, 22, 2)])
+    assert readings.slope("room_temperature") is None
+
+
+def test_time_in_state():
+    """Each interval is attributed to the state of its first reading."""
+    readings = filled(
+        3, [(0, 20, 22, 0), (10, 20, 22, 0), (20, 20, 22, 1), (50, 20, 22, 2)]
+    )
+    assert readings.time_in_state() == {0: 10.0, 1: 30.0}
@@ -0,0 +1,87 @@
+"""Test the journal of undelivered 4Heat commands."""
+
+import asyncio
+from importlib import import_module
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+journal = import_module("custom_components.4heat.journal")
+
+KEY = "4heat.code.commands"
+
+
+@pytest.fixture
+def clock(monkeypatch, storage):
+    """Return a settable clock used as the wall time of the journal."""
+    now = [1000.0]
+    monkeypatch.setattr(journal.time, "time", lambda: now[0])
+    return now
+
+
+def test_replace(clock, storage):
+    """A new command replaces the pending one of the same kind."""
+    commands = journal.CommandJournal(None, "code", 60)
+    commands.add(journal.COMMAND_TEMPERATURE, 20)
+    commands.add(journal.COMMAND_TEMPERATURE, 22)
+    assert commands.pending == {journal.COMMAND_TEMPERATURE: 22}
+    assert storage[KEY][journal.COMMAND_TEMPERATURE]["value"] == 22
+
+
+def test_remove(clock):
+    """Delivered commands are dropped and saved once."""
+    commands = journal.CommandJournal(None, "code", 60)
+    commands.add(journal.COMMAND_POWER, True)
+    commands.remove(journal.COMMAND_POWER)
+    commands.remove(journal.COMMAND_POWER)
+    assert commands.pending == {}
+    assert commands._store.saves == 2
+
+
+def test_replay_order(clock):
+    """Power comes first, then the power level and the setpoints."""
+    commands = journal.CommandJournal(None, "code", 60)
+    commands.add(journal.zone_command(2), 21)
+    commands.add(journal.COMMAND_TEMPERATURE, 22)
+    commands.add(journal.zone_command(1), 19)
+    commands.add(journal.COMMAND_POWER_LEVEL, 3)
+    commands.add(journal.COMMAND_POWER, True)
+    assert list(commands.pending) == [
+        journal.COMMAND_POWER,
+        journal.COMMAND_POWER_LEVEL,
+        journal.COMMAND_TEMPERATURE,
+        "zone_temperature_1",
+        "zone_temperature_2",
+    ]
+
+
+def test_expiry(clock, storage):
+    """Commands older than the expiry are dropped."""
+    commands = journal.CommandJournal(None, "code", 60)
+    commands.add(journal.COMMAND_POWER, True)
+    clock[0] += 30
+    commands.add(journal.COMMAND_TEMPERATURE, 22)
+    clock[0] += 31
+    assert commands.pending == {journal.COMMAND_TEMPERATURE: 22}
+    assert journal.COMMAND_POWER not in storage[KEY]
+
+
+def test_replay_after_restart(clock):
+    """Commands saved before a restart are loaded, unless expired."""
+    commands = journal.CommandJournal(None, "code", 60)
+    commands.add(journal.COMMAND_POWER, True)
+    clock[0] += 30
+    commands.add(journal.COMMAND_TEMPERATURE, 22)
+
+    clock[0] += 40
+    restarted = journal.CommandJournal(None, "code", 60)
+    asyncio.run(restarted.async_load())
+    assert restarted.pending == {journal.COMMAND_TEMPERATURE: 22}
+
+
+def test_load_nothing_saved(clock):
+    """Without saved data nothing is pending."""
+    commands = journal.CommandJournal(None, "code", 60)
+    asyncio.run(commands.async_load())
+    assert commands.pending == {}
@@ -0,0 +1,66 @@
+"""Test the load test harness of the TCP and decode path."""
+
+import asyncio
+
+import pytest
+
+from tools import loadtest
+from tools.component import load
+
+
+def test_build_frame():
+    """Simulated frames decode to the values they were built with."""
+    device_module = load("device")
+    loader = device_module._DeviceLoader()
+    loader.initiate(
+        {"comandi_term_princ": {"scritt_termostato": loadtest.THERMOSTAT_POSITION}}
+    )
+    device = device_module.Device(loader)
+    loader.load_from_local(device, loadtest.build_frame(5, 21, 22))
+    assert device.state == 5
+    assert device.room_temperature == 21
+    assert device.target_temperature == 22
+
+
+def test_percentile():
+    """Percentiles are taken from the sorted values."""
+    values = [float(value) for value in range(100, 0, -1)]
+    assert loadtest._percentile(values, 50) == 51.0
+    assert loadtest._percentile(values, 99) == 100.0
+    assert loadtest._percentile(values, 100) == 100.0
+    assert loadtest._percentile([], 50) == 0.0
+
+
+def test_run_step():
+    """All simulated devices are polled and measured."""
+
+    async def run():
+        ports = [await loadtest._serve_device(0, 0) for _ in range(3)]
+        return await loadtest.run_step(ports, 1, 3)
+
+    result = asyncio.run(run())
+    assert result["devices"] == 3
+    assert result["polls"] == 3
+    assert result["errors"] == 0
+    assert result["memory_kib_per_device"] > 0
+    assert result["p50"] <= result["p99"] <= result["max"]
+
+
+def test_run_step_unreachable(unused_port):
+    """Devices that do not answer are counted as errors."""
+    result = asyncio.run(loadtest.run_step([unused_port], 1, 1))
+    assert (result["polls"], result["errors"]) == (1, 1)
+
+
+@pytest.fixture
+def unused_port():
+    """Return a loopback port nothing listens on."""
+
+    async def find():
+        server = await asyncio.start_server(lambda *_: None, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        server.close()
+        await server.wait_closed()
+        return port
+
+    return asyncio.run(find())
@@ -0,0 +1,197 @@
+"""Test the parameter writes of 4Heat devices."""
+
+import asyncio
+
+import pytest
+
+from tools.component import load
+
+device_module = load("device")
+tiers = load("tiers")
+
+
+def parameter(id_par: int, value: int, minimum=0, maximum=200, step=5, dec=1):
+    """Return a par_value record."""
+    return (
+        f"0e{id_par:04x}{value & 0xFFFF:04x}{minimum:04x}{maximum:04x}00{dec:02x}"
+        f"{step:04x}{id_par:04x}"
+    )
+
+
+def test_parameter_write(read_device):
+    """A valid value is encoded in the record, in device units."""
+    device = read_device(parameter(7, 100))
+    record, raw = device.parameter_write(7, 12.5)
+    assert raw == 125
+    assert record == parameter(7, 125)[:28]
+    assert device_module.write_command([record]) == f'["2WC","1","05{record}"]'
+
+
+def test_parameter_write_float(read_device):
+    """Values are not rejected for the error of their float representation."""
+    device = read_device(parameter(7, 0, step=1))
+    assert device.parameter_write(7, 0.1 + 0.2)[1] == 3
+
+
+@pytest.mark.parametrize(
+    ("id_par", "value", "message"),
+    [
+        (9, 1, "Unknown parameter 9"),
+        (7, 20.5, "must be between 0.0 and 20.0"),
+        (7, -0.5, "must be between 0.0 and 20.0"),
+        (7, 12.3, "must change by 0.5"),
+        (7, 12.25, "must have at most 1 decimals"),
+        (7, 12.51, "must have at most 1 decimals"),
+    ],
+)
+def test_parameter_write_invalid(id_par, value, message, read_device):
+    """Unknown parameters and values out of range or step are rejected."""
+    device = read_device(parameter(7, 100))
+    with pytest.raises(ValueError, match=message):
+        device.parameter_write(id_par, value)
+
+
+def test_parameter_write_read_only(read_device):
+    """Read only parameters are rejected."""
+    record = parameter(7, 100)
+    device = read_device(f"{record[:18]}01{record[20:]}")
+    with pytest.raises(ValueError, match="read only"):
+        device.parameter_write(7, 10)
+
+
+def test_readback_verified(read_device):
+    """Parameters are verified when the read back holds the written value."""
+    device = read_device(parameter(7, 125), parameter(8, 20))
+    result = device.parameter_readback({7: 12.5, 8: 2}, {7: 125, 8: 20}, True)
+    assert result == {
+        "7": {"requested": 12.5, "value": 12.5, "verified": True},
+        "8": {"requested": 2, "value": 2.0, "verified": True},
+    }
+
+
+def test_readback_partial(read_device):
+    """Only the parameters holding the written value are verified."""
+    device = read_device(parameter(7, 125), parameter(8, 10))
+    result = device.parameter_readback({7: 12.5, 8: 2}, {7: 125, 8: 20}, True)
+    assert result["7"]["verified"] is True
+    assert result["8"] == {"requested": 2, "value": 1.0, "verified": False}
+
+
+def test_readback_failed(read_device):
+    """Nothing is verified when the read back failed."""
+    device = read_device(parameter(7, 125))
+    result = device.parameter_readback({7: 12.5}, {7: 125}, False)
+    assert result == {"7": {"requested": 12.5, "value": None, "verified": False}}
+
+
+def test_readback_missing(read_device):
+    """A parameter missing from the read back is not verified."""
+    device = read_device(parameter(7, 125))
+    result = device.parameter_readback({7: 12.5, 8: 2}, {7: 125, 8: 20}, True)
+    assert result["8"] == {"requested": 2, "value": None, "verified": False}
+
+
+class TestCoordinator:
+    """Test the write and read back of the coordinator."""
+
+    @pytest.fixture
+    def coordinator(self, monkeypatch, frame):
+        """Return a coordinator with its transports replaced."""
+        pytest.importorskip("homeassistant")
+        from importlib import import_module  # noqa: PLC0415
+
+        module = import_module("custom_components.4heat.coordinator")
+        device = import_module("custom_components.4heat.device")
+
+        async def no_sleep(_):
+            pass
+
+        monkeypatch.setattr(module.asyncio, "sleep", no_sleep)
+
+        coordinator = object.__new__(module.FourHeatDataUpdateCoordinator)
+        coordinator.loader = device._DeviceLoader()
+        coordinator.device = device.Device(coordinator.loader)
+        coordinator.loader.load_from_local(
+            coordinator.device, frame(parameter(7, 100), parameter(8, 10))
+        )
+        coordinator.tiers = module.RefreshTiers({tiers.TIER_PARAMETERS: 300})
+        coordinator._refresh_task = None
+        coordinator._refreshed_at = None
+        coordinator._updated_at = 1.0
+        coordinator.sent = []
+        coordinator.reply = frame(parameter(7, 125), parameter(8, 10))
+
+        async def deliver(kind, value):
+            coordinator.sent.append((kind, value))
+            return True
+
+        async def refresh():
+            coordinator.loader.load_from_local(coordinator.device, coordinator.reply)
+            coordinator._updated_at += 1
+
+        coordinator._FourHeatDataUpdateCoordinator__deliver = deliver
+        coordinator.async_refresh = refresh
+        return coordinator
+
+    def test_partial(self, coordinator):
+        """One command is sent and each parameter is verified on its own."""
+        result = asyncio.run(coordinator.async_set_parameters({7: 12.5, 8: 2}))
+        assert len(coordinator.sent) == 1
+        assert len(coordinator.sent[0][1]) == 2
+        assert result["7"]["verified"] is True
+        assert result["8"]["verified"] is False
+
+    def test_invalid(self, coordinator):
+        """Nothing is sent when a value is invalid."""
+        with pytest.raises(ValueError):
+            asyncio.run(coordinator.async_set_parameters({7: 12.5, 8: 99}))
+        assert coordinator.sent == []
+
+    def test_stale(self, coordinator):
+        """Stale data served when the read back fails verifies nothing."""
+
+        async def refresh():
+            pass
+
+        coordinator.async_refresh = refresh
+        result = asyncio.run(coordinator.async_set_parameters({7: 12.5}))
+        assert result["7"] == {"requested": 12.5, "value": None, "verified": False}
+
+    def test_refresh_in_flight(self, coordinator):
+        """A refresh started before the write is not used as read back."""
+        calls = []
+
+        async def run():
+            in_flight = asyncio.get_running_loop().create_future()
+            coordinator._refresh_task = in_flight
+
+            async def refresh():
+                calls.append(in_flight.done())
+                coordinator.loader.load_from_local(
+                    coordinator.device, coordinator.reply
+                )
+                coordinator._updated_at += 1
+
+            coordinator.async_refresh = refresh
+            asyncio.get_running_loop().call_soon(in_flight.set_result, None)
+            return await coordinator.async_set_parameters({7: 12.5})
+
+        result = asyncio.run(run())
+        assert calls == [True]
+        assert result["7"]["verified"] is True
+
+    def test_refresh_in_flight_failed(self, coordinator):
+        """A failed refresh in flight does not fail the write."""
+        from homeassistant.helpers.update_coordinator import (  # noqa: PLC0415
+            UpdateFailed,
+        )
+
+        async def run():
+            in_flight = asyncio.get_running_loop().create_future()
+            coordinator._refresh_task = in_flight
+            asyncio.get_running_loop().call_soon(
+                in_flight.set_exception, UpdateFailed("unreachable")
+            )
+            return await coordinator.async_set_parameters({7: 12.5})
+
+        assert asyncio.run(run())["7"]["verified"] is True
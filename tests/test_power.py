@@ -0,0 +1,98 @@
+"""Test the power level of 4Heat devices."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+# Power level 4 between 1 and 5
+POWER = "060104010500"
+
+
+def test_power_level(read_device):
+    """The power level is read from the pw_all record."""
+    device = read_device(POWER)
+    assert device.power_level == 4
+    assert device.power_level_writable
+
+
+def test_power_level_command(read_device):
+    """The level replaces the one of the pw_all record."""
+    assert read_device(POWER).power_level_command(2) == '["2WC","1","05060102010500"]'
+
+
+@pytest.mark.parametrize("level", [0, 6])
+def test_power_level_out_of_range(level, read_device):
+    """Levels outside the range of the record are rejected."""
+    with pytest.raises(ValueError, match="must be between 1 and 5"):
+        read_device(POWER).power_level_command(level)
+
+
+@pytest.mark.parametrize("records", [(), (f"{POWER[:10]}01",)])
+def test_power_level_not_writable(records, read_device):
+    """Without a writable pw_all record the level can not be set."""
+    device = read_device(*records)
+    assert not device.power_level_writable
+    with pytest.raises(ValueError, match="can not be set"):
+        device.power_level_command(3)
+
+
+# State info 81 record reporting power level 3
+STATE_INFO_81 = "0c810033" + "00" * 10
+
+
+class TestEntities:
+    """Test the power level entities of a device."""
+
+    @pytest.fixture
+    def setup(self, read_device):
+        """Return a builder of the entities of a platform for the records."""
+        pytest.importorskip("homeassistant")
+        from importlib import import_module  # noqa: PLC0415
+
+        def build(platform: str, *records: str) -> dict:
+            device = read_device(*records)
+            coordinator = SimpleNamespace(
+                device=device, loader=device._loader, last_update_success=True
+            )
+            hass = SimpleNamespace(
+                data={"4heat": {"entry": SimpleNamespace(coordinator=coordinator)}}
+            )
+            entities = []
+            module = import_module(f"custom_components.4heat.{platform}")
+            asyncio.run(
+                module.async_setup_entry(
+                    hass, SimpleNamespace(entry_id="entry"), entities.extend
+                )
+            )
+            return {entity.parameter: entity for entity in entities}
+
+        return build
+
+    def test_read_only(self, setup):
+        """A read only pw_all record only gets its record sensor."""
+        record = f"{POWER[:10]}01"
+        sensors = setup("sensor", record)
+        assert "pw_all_1" in sensors
+        assert "power_level" not in sensors
+        assert setup("number", record) == {}
+
+    def test_state_info_81(self, setup):
+        """A level only reported by state_info_81 gets a power level sensor."""
+        assert "power_level" in setup("sensor", STATE_INFO_81)
+        assert setup("number", STATE_INFO_81) == {}
+
+    def test_writable(self, setup):
+        """A writable pw_all record gets a number within its range."""
+        number = setup("number", POWER)["power_level"]
+        assert (number.native_min_value, number.native_max_value) == (1, 5)
+        assert number.native_value == 4
+        assert number.available
+
+    def test_record_missing(self, setup, frame):
+        """A frame without the pw_all record makes the number unavailable."""
+        number = setup("number", POWER)["power_level"]
+        device = number.coordinator.device
+        device._loader.load_from_local(device, frame())
+        assert not number.available
+        assert number.native_min_value < number.native_max_value
@@ -0,0 +1,108 @@
+"""Test the mapping of the records of 4Heat frames to values."""
+
+import struct
+
+import pytest
+
+from tools.component import load
+
+records = load("records")
+
+
+def record(code: int, record_id: int, data: dict[int, bytes], size: int) -> bytes:
+    """Return a lower case hex record with data at byte offsets."""
+    raw = bytearray(size)
+    raw[0], raw[1] = code, record_id
+    for offset, value in data.items():
+        raw[offset : offset + len(value)] = value
+    return raw.hex().encode()
+
+
+MAIN = record(0x10, 0, {3: struct.pack(">h", 215), 18: b"\x01"}, 19)
+PROBE = record(0x02, 3, {3: struct.pack(">h", -15)}, 7)
+ZONE = record(0x22, 2, {13: struct.pack(">h", 195), 15: b"\x01"}, 16)
+POWER = record(0x06, 1, {2: b"\x04"}, 3)
+
+
+def test_map_fields():
+    """Values keep the position and id of their record."""
+    fields = records.map_fields([MAIN, b"0b00", PROBE, ZONE, POWER])
+    assert [
+        (field.key, field.position, field.record_id, field.kind) for field in fields
+    ] == [
+        ("temp_sec", 0, 0, records.KIND_TEMPERATURE),
+        ("th_temp_3", 2, 3, records.KIND_TEMPERATURE),
+        ("th_all_2_2", 3, 2, records.KIND_TEMPERATURE),
+        ("pw_all_1", 4, 1, records.KIND_POWER),
+    ]
+
+
+def test_views():
+    """Records may be views into the frame."""
+    frame = b"xx" + PROBE
+    fields = records.map_fields([memoryview(frame)[2:]])
+    assert [field.key for field in fields] == ["th_temp_3"]
+
+
+def test_duplicate_keys():
+    """Only the first record of an id is mapped."""
+    fields = records.map_fields([PROBE, MAIN, PROBE])
+    assert [(field.key, field.position) for field in fields] == [
+        ("th_temp_3", 0),
+        ("temp_sec", 1),
+    ]
+
+
+def test_short_record():
+    """Records too short for their value are skipped."""
+    assert records.map_fields([PROBE[:8], POWER[:4]]) == []
+
+
+@pytest.mark.parametrize(
+    ("data", "value"),
+    [(MAIN, 21.5), (PROBE, -15), (ZONE, 19.5), (POWER, 4)],
+)
+def test_unpack(data, value):
+    """Values are unpacked and scaled by their decimals."""
+    (field,) = records.map_fields([data])
+    assert field.unpack(bytes.fromhex(data.decode())) == value
+
+
+def test_unpack_without_decimals():
+    """Values with no decimals, or records without them, are not scaled."""
+    (field,) = records.map_fields([MAIN])
+    assert field.unpack(bytes.fromhex(MAIN.decode())[:18]) == 215
+    raw = bytearray.fromhex(MAIN.decode())
+    raw[18] = 0
+    assert field.unpack(bytes(raw)) == 215
+
+
+def test_scale():
+    """Values are divided by ten to the power of the decimals of the record."""
+    assert records.scale(215, bytes([0, 2]), 1) == 2.15
+    assert records.scale(215, bytes([0, 0]), 1) == 215
+    assert records.scale(215, bytes([0]), 1) == 215
+    assert records.scale(215, bytes([0, 2]), None) == 215
+
+
+# Main values with both temperatures at 21.5 degrees, with one decimal
+SCALED_MAIN = record(
+    0x10, 0, {3: struct.pack(">h", 215), 10: struct.pack(">h", 215), 18: b"\x01"}, 20
+).decode()
+
+
+def test_room_temperature(read_device):
+    """The room temperature is scaled like the other value of its record."""
+    device = read_device(main_values=SCALED_MAIN)
+    assert device.room_temperature == 21.5
+    assert device.values["temp_sec"] == 21.5
+
+
+def test_room_temperature_cloud(cloud):
+    """The room temperature read from the cloud is scaled too."""
+    device_module = load("device")
+    loader = device_module._DeviceLoader()
+    device = device_module.Device(loader)
+    loader.load_from_cloud(device, cloud(main_values=SCALED_MAIN))
+    assert device.room_temperature == 21.5
+    assert device.values["temp_sec"] == 21.5
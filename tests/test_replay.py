@@ -0,0 +1,18 @@
+"""Test the replay of capture files through the decoder."""
+
+from tools import replay
+from tools.component import load
+
+capture = load("capture")
+
+
+def test_replay(tmp_path, frame):
+    """Every frame of the files is decoded and the failures are counted."""
+    paths = [str(tmp_path / "frames.bin.1"), str(tmp_path / "frames.bin")]
+    for path, payload in zip(paths, (frame(), b'["2WL","1","zz"]'), strict=True):
+        recorder = capture.FrameRecorder(path, 1024, 0)
+        recorder.append(capture.TRANSPORT_LOCAL, payload, 1.0)
+        recorder.close()
+
+    result = replay.replay(paths)
+    assert (result["frames"], result["errors"]) == (2, 1)
@@ -0,0 +1,52 @@
+"""Test the ring buffer of raw frames."""
+
+from tools.component import load
+
+ring = load("ring")
+
+
+def test_empty():
+    """An empty buffer dumps nothing."""
+    assert ring.FrameRingBuffer(3).as_list() == []
+
+
+def test_oldest_first():
+    """Frames are dumped oldest first until the buffer is full."""
+    buffer = ring.FrameRingBuffer(3)
+    buffer.record("tcp", "poll", b"a", None, 0.1)
+    buffer.record("cloud", "tcp_failed", "b", None, 0.2)
+    assert [frame["raw"] for frame in buffer.as_list()] == ["a", "b"]
+    assert buffer.as_list()[1]["transport"] == "cloud"
+
+
+def test_wrap_around():
+    """The oldest frames are overwritten once the buffer is full."""
+    buffer = ring.FrameRingBuffer(3)
+    for raw in (b"1", b"2", b"3", b"4", b"5"):
+        buffer.record("tcp", "poll", raw, None, 0.0)
+    assert [frame["raw"] for frame in buffer.as_list()] == ["3", "4", "5"]
+
+
+def test_slots_reused():
+    """Recording overwrites the preallocated slots."""
+    buffer = ring.FrameRingBuffer(2)
+    slots = list(buffer._slots)
+    for raw in (b"1", b"2", b"3"):
+        buffer.record("tcp", "poll", raw, None, 0.0)
+    assert buffer._slots == slots
+
+
+def test_to_dict():
+    """Decoded values, errors and invalid bytes are serialized on a dump."""
+    buffer = ring.FrameRingBuffer(1)
+    buffer.record("tcp", "poll", b"\xff2WL", (2, 0, 21, 22), 0.12345, ValueError("bad"))
+    frame = buffer.as_list()[0]
+    assert frame["raw"] == "�2WL"
+    assert frame["decoded"] == {
+        "state": 2,
+        "error_code": 0,
+        "room_temperature": 21,
+        "target_temperature": 22,
+    }
+    assert frame["duration"] == 0.123
+    assert frame["error"] == "ValueError('bad')"
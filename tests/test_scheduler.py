@@ -0,0 +1,158 @@
+"""Test the scheduling of requests to a 4Heat device."""
+
+import asyncio
+
+import pytest
+
+from tools.component import load
+
+scheduler = load("scheduler")
+
+
+async def hold(device, priority, name, order, started=None, release=None):
+    """Record the name once the device is held, until released."""
+    async with device.slot(priority):
+        order.append(name)
+        if started is not None:
+            started.set()
+        if release is not None:
+            await release.wait()
+
+
+def test_priority():
+    """Commands waiting for the device run before polls."""
+
+    async def run():
+        device = scheduler.DeviceScheduler()
+        order = []
+        started, release = asyncio.Event(), asyncio.Event()
+        first = asyncio.create_task(
+            hold(device, scheduler.PRIORITY_POLL, "poll", order, started, release)
+        )
+        await started.wait()
+        waiting = [
+            asyncio.create_task(hold(device, priority, name, order))
+            for priority, name in (
+                (scheduler.PRIORITY_POLL, "poll 1"),
+                (scheduler.PRIORITY_COMMAND, "command 1"),
+                (scheduler.PRIORITY_POLL, "poll 2"),
+                (scheduler.PRIORITY_COMMAND, "command 2"),
+            )
+        ]
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(first, *waiting)
+        return order
+
+    assert asyncio.run(run()) == [
+        "poll",
+        "command 1",
+        "command 2",
+        "poll 1",
+        "poll 2",
+    ]
+
+
+def test_cancelled_waiter():
+    """A cancelled request does not keep the device busy."""
+
+    async def run():
+        device = scheduler.DeviceScheduler()
+        order = []
+        started, release = asyncio.Event(), asyncio.Event()
+        first = asyncio.create_task(
+            hold(device, scheduler.PRIORITY_POLL, "poll", order, started, release)
+        )
+        await started.wait()
+        cancelled = asyncio.create_task(
+            hold(device, scheduler.PRIORITY_COMMAND, "cancelled", order)
+        )
+        later = asyncio.create_task(
+            hold(device, scheduler.PRIORITY_POLL, "later", order)
+        )
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        release.set()
+        await asyncio.gather(first, later)
+        with pytest.raises(asyncio.CancelledError):
+            await cancelled
+        async with device.slot(scheduler.PRIORITY_POLL):
+            order.append("last")
+        return order
+
+    assert asyncio.run(run()) == ["poll", "later", "last"]
+
+
+def test_shared_read():
+    """Concurrent reads share the read in flight."""
+
+    async def run():
+        device = scheduler.DeviceScheduler()
+        calls = []
+
+        async def fetch():
+            calls.append(None)
+            await asyncio.sleep(0)
+            return len(calls)
+
+        shared = await asyncio.gather(*(device.read(fetch) for _ in range(3)))
+        return shared, await device.read(fetch)
+
+    assert asyncio.run(run()) == ([1, 1, 1], 2)
+
+
+def test_shared_read_error():
+    """A failed read raises in every caller and is not kept."""
+
+    async def run():
+        device = scheduler.DeviceScheduler()
+
+        async def fail():
+            await asyncio.sleep(0)
+            raise OSError("unreachable")
+
+        async def succeed():
+            return "frame"
+
+        results = await asyncio.gather(
+            device.read(fail), device.read(fail), return_exceptions=True
+        )
+        return results, await device.read(succeed)
+
+    results, frame = asyncio.run(run())
+    assert all(isinstance(result, OSError) for result in results)
+    assert frame == "frame"
+
+
+def test_read_cancelled():
+    """The read is cancelled once all its callers are."""
+
+    async def run():
+        device = scheduler.DeviceScheduler()
+        started, events = asyncio.Event(), []
+
+        async def fetch():
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                events.append("cancelled")
+                raise
+            return "frame"
+
+        callers = [asyncio.ensure_future(device.read(fetch)) for _ in range(2)]
+        await started.wait()
+        callers[0].cancel()
+        await asyncio.sleep(0)
+        events.append("one left")
+        callers[1].cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+        await asyncio.sleep(0)
+
+        async def fetch_again():
+            return "frame"
+
+        events.append(await device.read(fetch_again))
+        return events
+
+    assert asyncio.run(run()) == ["one left", "cancelled", "frame"]
@@ -0,0 +1,88 @@
+"""Test the recorder deadband of the 4Heat sensors."""
+
+from importlib import import_module
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+sensor = import_module("custom_components.4heat.sensor")
+
+
+def written(sensor_class, parameter, value, deadbands=None, interval=0):
+    """Return a sensor whose last written state was the value."""
+
+    class Sensor(sensor_class):
+        available = True
+
+    entity = object.__new__(Sensor)
+    entity.parameter = parameter
+    entity.coordinator = SimpleNamespace(
+        deadbands=deadbands or {}, min_write_interval=interval
+    )
+    entity._written_value = value
+    entity._written_available = True
+    entity._written_at = sensor.time.monotonic()
+    return entity
+
+
+@pytest.mark.parametrize(
+    ("value", "significant"), [(20.0, False), (20.4, False), (20.5, True), (19.5, True)]
+)
+def test_deadband_option(value, significant):
+    """A value is written once it moved by the configured deadband."""
+    entity = written(
+        sensor.FourHeatTemperatureSensor,
+        "room_temperature",
+        20.0,
+        {"room_temperature": 0.5},
+    )
+    assert entity._is_significant(value) is significant
+
+
+def test_default_deadband():
+    """Without an option the deadband of the sensor class is used."""
+    entity = written(sensor.FourHeatDutyCycleSensor, "duty_cycle", 50.0)
+    assert not entity._is_significant(50.9)
+    assert entity._is_significant(51.0)
+
+
+def test_record_temperature_deadband():
+    """Generated temperature sensors use the room temperature deadband."""
+    entity = written(
+        sensor.FourHeatRecordTemperatureSensor,
+        "probe_1",
+        20.0,
+        {"room_temperature": 0.5},
+    )
+    assert not entity._is_significant(20.3)
+    assert entity._is_significant(20.5)
+
+
+def test_without_deadband():
+    """Without a deadband every change is written."""
+    entity = written(sensor.FourHeatTemperatureSensor, "target_temperature", 20.0)
+    assert not entity._is_significant(20.0)
+    assert entity._is_significant(20.1)
+    assert entity._is_significant(None)
+
+
+def test_min_write_interval():
+    """No change is written within the minimum write interval."""
+    entity = written(
+        sensor.FourHeatTemperatureSensor, "room_temperature", 20.0, interval=60
+    )
+    assert not entity._is_significant(25.0)
+
+    entity._written_at -= 60
+    assert entity._is_significant(25.0)
+
+
+def test_availability_change():
+    """A change of availability is always written."""
+    entity = written(
+        sensor.FourHeatTemperatureSensor, "room_temperature", 20.0, interval=60
+    )
+    entity._written_available = False
+    assert entity._is_significant(20.0)
@@ -0,0 +1,102 @@
+"""Test the refresh tiers of 4Heat devices."""
+
+import pytest
+
+from tools.component import load
+
+device_module = load("device")
+tiers = load("tiers")
+
+INTERVALS = {tiers.TIER_PARAMETERS: 300, tiers.TIER_IDENTITY: 3600}
+HOT = frozenset({tiers.TIER_HOT})
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Return a settable clock used as the monotonic time of the tiers."""
+    now = [100.0]
+    monkeypatch.setattr(tiers.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_never_refreshed(clock):
+    """Tiers never refreshed are due."""
+    refresh = tiers.RefreshTiers(INTERVALS)
+    assert refresh.due() == tiers.ALL_TIERS
+    assert refresh.as_dict() == {
+        tiers.TIER_PARAMETERS: None,
+        tiers.TIER_IDENTITY: None,
+    }
+
+
+def test_due(clock):
+    """The hot tier is always due, the others once their interval passed."""
+    refresh = tiers.RefreshTiers(INTERVALS)
+    refresh.done(refresh.due())
+    assert refresh.due() == HOT
+
+    clock[0] += 299
+    assert refresh.due() == HOT
+    assert refresh.as_dict() == {
+        tiers.TIER_PARAMETERS: 1.0,
+        tiers.TIER_IDENTITY: 3301.0,
+    }
+    clock[0] += 1
+    assert refresh.due() == {tiers.TIER_HOT, tiers.TIER_PARAMETERS}
+
+
+def test_done_partial(clock):
+    """Only the tiers refreshed are reset."""
+    refresh = tiers.RefreshTiers(INTERVALS)
+    refresh.done(frozenset({tiers.TIER_HOT, tiers.TIER_IDENTITY}))
+    assert refresh.due() == {tiers.TIER_HOT, tiers.TIER_PARAMETERS}
+
+
+def test_invalidate(clock):
+    """An invalidated tier is due on the next poll."""
+    refresh = tiers.RefreshTiers(INTERVALS)
+    refresh.done(refresh.due())
+    refresh.invalidate(tiers.TIER_IDENTITY)
+    refresh.invalidate(tiers.TIER_IDENTITY)
+    assert refresh.due() == {tiers.TIER_HOT, tiers.TIER_IDENTITY}
+    assert refresh.as_dict()[tiers.TIER_IDENTITY] is None
+
+
+PARAMETER = "0e00070064000000c8000100050007"
+
+
+def test_cloud_tiers(cloud):
+    """Parameters are only decoded when their tier is due."""
+    loader = device_module._DeviceLoader()
+    device = device_module.Device(loader)
+    loader.load_from_cloud(device, cloud(PARAMETER), HOT)
+    assert device.parameters == {}
+    assert device.name is None
+
+    loader.load_from_cloud(device, cloud(PARAMETER))
+    assert device.name == "Stove"
+    assert device.parameters[7]["value"] == 100
+
+
+def test_cloud_unchanged_message(cloud):
+    """An unchanged message is decoded again only for due parameters."""
+    loader = device_module._DeviceLoader()
+    device = device_module.Device(loader)
+    data = cloud(PARAMETER)
+    loader.load_from_cloud(device, data, HOT)
+    device.room_temperature = None
+
+    # Already decoded without parameters
+    loader.load_from_cloud(device, data, HOT)
+    assert device.room_temperature is None
+
+    # Parameters are due but were skipped last time
+    loader.load_from_cloud(device, data)
+    assert device.room_temperature is not None
+    assert 7 in device.parameters
+
+    # Already decoded with parameters
+    device.room_temperature = None
+    loader.load_from_cloud(device, data)
+    loader.load_from_cloud(device, data, HOT)
+    assert device.room_temperature is None
@@ -0,0 +1,85 @@
+"""Test the thermostat zones of 4Heat devices."""
+
+import asyncio
+from importlib import import_module
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+# Zone 2, enabled, setpoint 19.5 between 10.0 and 30.0, at 19.2 degrees
+ZONE = "22020001" + "00" + "00c3" + "0064" + "012c" + "0000" + "00c0" + "01"
+
+
+def test_zones(read_device):
+    """The th_all_2 records are decoded by zone id."""
+    zone = read_device(ZONE).zones[2]
+    assert (zone["value"], zone["min"], zone["max"]) == (195, 100, 300)
+    assert zone["temperature"] == 192
+    assert zone["pos_punto"] == 1
+
+
+def test_zone_temperature_command(read_device):
+    """The setpoint replaces the one of the zone record."""
+    command = read_device(ZONE).zone_temperature_command(2, 210)
+    assert command == f'["2WC","1","05{ZONE[:10]}00d2{ZONE[14:]}"]'
+
+
+def test_zone_temperature_command_negative(read_device):
+    """Negative setpoints are written in two's complement."""
+    command = read_device(ZONE).zone_temperature_command(2, -5)
+    assert f"{ZONE[:10]}fffb{ZONE[14:]}" in command
+
+
+def test_unknown_zone(read_device):
+    """Zones missing from the frame are rejected."""
+    with pytest.raises(ValueError, match="Unknown thermostat zone 3"):
+        read_device(ZONE).zone_temperature_command(3, 210)
+
+
+class TestEntities:
+    """Test the climates of the zones of a device."""
+
+    @pytest.fixture
+    def zone(self, read_device):
+        """Return the climate of zone 2, with a coordinator recording calls."""
+        pytest.importorskip("homeassistant")
+        climate = import_module("custom_components.4heat.climate")
+        coordinator = Mock(device=read_device(ZONE), last_update_success=True)
+        coordinator.async_refresh = AsyncMock()
+        coordinator.async_turn_off = AsyncMock()
+        coordinator.async_turn_on = AsyncMock()
+        return climate.FourHeatZoneClimate(coordinator, 2)
+
+    def test_heat_only(self, zone):
+        """Zones only heat and can not be turned on or off."""
+        from homeassistant.components.climate import (  # noqa: PLC0415
+            ClimateEntityFeature,
+            HVACMode,
+        )
+
+        assert zone.hvac_modes == [HVACMode.HEAT]
+        assert zone.hvac_mode == HVACMode.HEAT
+        assert zone.supported_features == ClimateEntityFeature.TARGET_TEMPERATURE
+
+    @pytest.mark.parametrize(
+        "call",
+        [
+            lambda zone: zone.async_set_hvac_mode("off"),
+            lambda zone: zone.async_turn_off(),
+            lambda zone: zone.async_turn_on(),
+            lambda zone: zone.async_toggle(),
+        ],
+    )
+    def test_off_rejected(self, zone, call):
+        """Zones do not turn the shared stove off."""
+        from homeassistant.exceptions import ServiceValidationError  # noqa: PLC0415
+
+        with pytest.raises(ServiceValidationError, match="Zone 2 can not be turned"):
+            asyncio.run(call(zone))
+        zone.coordinator.async_turn_off.assert_not_called()
+        zone.coordinator.async_turn_on.assert_not_called()
+
+    def test_heat(self, zone):
+        """Setting the HEAT mode leaves the stove alone."""
+        asyncio.run(zone.async_set_hvac_mode("heat"))
+        zone.coordinator.async_turn_on.assert_not_called()
@@ -0,0 +1 @@
+"""Command line tools for 4Heat devices, run without Home Assistant."""
@@ -0,0 +1,35 @@
+"""Import the modules of the 4Heat integration without Home Assistant.
+
+The package __init__ of the integration sets it up in Home Assistant and
+imports it. The modules the command line tools are made of do not, so the
+component directory is registered as a package of its own, whose __init__
+is never run, and they are imported from it.
+"""
+
+from importlib import import_module
+from importlib.machinery import ModuleSpec
+from importlib.util import module_from_spec
+from pathlib import Path
+import sys
+from types import ModuleType
+
+PACKAGE = "fourheat"
+COMPONENT_DIR = Path(__file__).resolve().parents[1] / "custom_components" / "4heat"
+
+
+def register() -> None:
+    """Register the component directory as the package, once.
+
+    The modules of the integration are then imported from the package, e.g.
+    "from fourheat.device import Device".
+    """
+    if PACKAGE not in sys.modules:
+        package = module_from_spec(ModuleSpec(PACKAGE, None, is_package=True))
+        package.__path__ = [str(COMPONENT_DIR)]
+        sys.modules[PACKAGE] = package
+
+
+def load(name: str) -> ModuleType:
+    """Return a module of the integration, e.g. "device"."""
+    register()
+    return import_module(f"{PACKAGE}.{name}")
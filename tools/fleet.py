@@ -0,0 +1,249 @@
+"""Headless poller for a fleet of 4Heat devices.
+
+Polls many devices concurrently, without Home Assistant, and writes one JSON
+snapshot per poll (NDJSON) to stdout or a file. Devices are read over TCP,
+falling back to the cloud when credentials are given.
+
+The fleet file is a JSON list of devices:
+
+    [
+        {"code": "...", "ip": "192.168.1.18", "file_map": "map.json"},
+        {"code": "...", "pin": "...", "username": "...", "password": "..."}
+    ]
+
+"ip" is resolved from the cloud when missing. "file_map" is a path or an
+inline object, and is fetched from the cloud when missing and credentials
+are given.
+
+Usage:
+    python -m tools.fleet fleet.json [--output polls.ndjson]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from datetime import datetime
+import json
+import logging
+import random
+import sys
+import time
+from typing import Any, TextIO
+
+from .component import register
+
+register()
+
+from fourheat.api import API, APIAuthError, APIConnectionError  # noqa: E402
+from fourheat.backoff import DecorrelatedJitterBackoff  # noqa: E402
+from fourheat.device import Device, DeviceDataLoadError, _DeviceLoader  # noqa: E402
+from fourheat.tcp import TCPCommunication, TCPCommunicationError  # noqa: E402
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class FleetDevice:
+    """State of a single polled device."""
+
+    def __init__(self, config: dict[str, Any]) -> None:
+        """Initialise."""
+        self.code: str = config["code"]
+        self.api: API | None = None
+        self.token: dict[str, Any] | None = None
+        self.file_map = config.get("file_map")
+        # Read before the event loop starts, file reads would block it
+        if isinstance(self.file_map, str):
+            with open(self.file_map, encoding="utf-8") as file:
+                self.file_map = json.load(file)
+        self.loader = _DeviceLoader()
+        self.device = Device(self.loader)
+        self.device.ip = config.get("ip")
+        self.tcp_client: TCPCommunication | None = None
+        self.backoff: DecorrelatedJitterBackoff | None = None
+
+        if config.get("username"):
+            self.api = API(
+                self.code, config["pin"], config["username"], config["password"]
+            )
+
+    async def __auth(self) -> None:
+        if self.token is None:
+            self.token = await self.api.get_token()
+            if not self.token or not self.token.get("access_token"):
+                self.token = None
+                raise APIAuthError("Authentication failed")
+
+    async def __read_cloud(self) -> None:
+        await self.__auth()
+        try:
+            self.loader.load_from_cloud(
+                self.device, await self.api.get_data(self.token)
+            )
+        except APIConnectionError:
+            # The token may have expired, get a new one on the next attempt
+            self.token = None
+            raise
+
+    async def setup(self) -> None:
+        """Fetch the file map when not given and resolve the device address."""
+        if self.file_map is None and self.api:
+            await self.__auth()
+            self.file_map = await self.api.get_file_map(self.token)
+        self.loader.initiate(self.file_map)
+
+        if self.device.ip is None:
+            if self.api is None:
+                raise APIConnectionError(
+                    f"No IP address or credentials for {self.code}"
+                )
+            await self.__read_cloud()
+        self.tcp_client = TCPCommunication(self.device.ip, self.device.port)
+
+    async def poll(self) -> str:
+        """Read the device and return the transport used."""
+        try:
+            self.loader.load_from_local(self.device, await self.tcp_client.read_data())
+        except TCPCommunicationError:
+            if self.api is None:
+                raise
+            await self.__read_cloud()
+            if self.device.ip != self.tcp_client.ip:
+                self.tcp_client = TCPCommunication(self.device.ip, self.device.port)
+            return "cloud"
+        return "tcp"
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return the decoded values of the device."""
+        return {
+            "state": self.device.state,
+            "state_desc": self.device.state_description,
+            "error_code": self.device.error_code,
+            "error": self.device.error_description,
+            "room_temperature": self.device.room_temperature,
+            "target_temperature": self.device.target_temperature,
+        }
+
+
+class FleetPoller:
+    """Poll devices on jittered schedules with bounded concurrency.
+
+    Each device runs its own schedule, starting at a random offset within
+    the interval. After a failed poll the device is retried with decorrelated
+    jitter backoff instead, so unreachable devices do not hold poll slots and
+    devices that failed together do not retry together.
+    """
+
+    def __init__(
+        self,
+        devices: list[FleetDevice],
+        output: TextIO,
+        interval: float,
+        concurrency: int,
+        jitter: float,
+        max_backoff: float,
+    ) -> None:
+        """Initialise."""
+        self.devices = devices
+        self.output = output
+        self.interval = interval
+        self.jitter = jitter
+        self.max_backoff = max_backoff
+        self.semaphore = asyncio.Semaphore(concurrency)
+
+    def __emit(self, record: dict[str, Any]) -> None:
+        self.output.write(json.dumps(record, default=str, separators=(",", ":")))
+        self.output.write("\n")
+        self.output.flush()
+
+    def __delay(self, fleet_device: FleetDevice) -> float:
+        if fleet_device.backoff.failures:
+            return fleet_device.backoff.delay
+        return self.interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    async def __poll(self, fleet_device: FleetDevice) -> None:
+        record: dict[str, Any] = {
+            "timestamp": datetime.now().isoformat(),
+            "code": fleet_device.code,
+        }
+        started = time.perf_counter()
+
+        try:
+            async with self.semaphore:
+                if fleet_device.tcp_client is None:
+                    await fleet_device.setup()
+                record["transport"] = await fleet_device.poll()
+        except (
+            APIAuthError,
+            APIConnectionError,
+            DeviceDataLoadError,
+            TCPCommunicationError,
+            OSError,
+        ) as e:
+            fleet_device.backoff.failed()
+            record.update(
+                ok=False, failures=fleet_device.backoff.failures, error=repr(e)
+            )
+        else:
+            fleet_device.backoff.succeeded()
+            record.update(ok=True, ip=fleet_device.device.ip, **fleet_device.snapshot())
+
+        record["latency"] = round(time.perf_counter() - started, 3)
+        self.__emit(record)
+
+    async def __run_device(self, fleet_device: FleetDevice, polls: int | None):
+        fleet_device.backoff = DecorrelatedJitterBackoff(
+            self.interval, self.max_backoff
+        )
+        await asyncio.sleep(random.uniform(0, self.interval))
+        count = 0
+        while polls is None or count < polls:
+            await self.__poll(fleet_device)
+            count += 1
+            if polls is None or count < polls:
+                await asyncio.sleep(self.__delay(fleet_device))
+
+    async def run(self, polls: int | None = None) -> None:
+        """Poll all devices, forever or the given number of times each."""
+        await asyncio.gather(
+            *(self.__run_device(fleet_device, polls) for fleet_device in self.devices)
+        )
+
+
+def main() -> None:
+    """Run the fleet poller from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("fleet", help="JSON file with the list of devices")
+    parser.add_argument("--output", help="NDJSON output file, defaults to stdout")
+    parser.add_argument("--interval", type=float, default=30, help="seconds")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--jitter", type=float, default=0.1, help="0 to 1")
+    parser.add_argument("--max-backoff", type=float, default=600, help="seconds")
+    parser.add_argument("--polls", type=int, help="polls per device, default forever")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, stream=sys.stderr)
+
+    with open(args.fleet, encoding="utf-8") as file:
+        devices = [FleetDevice(config) for config in json.load(file)]
+
+    output = open(args.output, "a", encoding="utf-8") if args.output else sys.stdout  # noqa: SIM115
+    try:
+        poller = FleetPoller(
+            devices,
+            output,
+            args.interval,
+            args.concurrency,
+            args.jitter,
+            args.max_backoff,
+        )
+        asyncio.run(poller.run(args.polls))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""Load test of the TCP and decode path against simulated 4Heat devices.
+
+Simulated devices listen on loopback ports in a separate process, so their
+CPU time is not counted against the poller. Each one answers "2WL" reads
+with a synthetic frame and acknowledges "2WC" writes, after a configurable
+latency. For every fleet size the same TCPCommunication and _DeviceLoader
+path used by the integration polls all devices and the harness reports
+throughput, CPU time per poll, memory per device and latency percentiles.
+
+Usage:
+    python -m tools.loadtest --devices 10 100 500 --rounds 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+from multiprocessing.connection import Connection
+import random
+import statistics
+import time
+import tracemalloc
+
+from .component import register
+
+register()
+
+from fourheat.device import Device, DeviceDataLoadError, _DeviceLoader  # noqa: E402
+from fourheat.tcp import TCPCommunication, TCPCommunicationError  # noqa: E402
+
+THERMOSTAT_POSITION = 12
+FRAME_RECORDS = 24
+
+
+def build_frame(state: int, room_temperature: int, target_temperature: int) -> bytes:
+    """Build a synthetic "2WL" reply."""
+    records = [f"02{index:02x}00{200 + index:04x}" for index in range(FRAME_RECORDS)]
+    records[0] = f"1000000000{state:02x}00000000{room_temperature:04x}000000000000"
+    records[THERMOSTAT_POSITION - 1] = (
+        f"12005a{target_temperature:04x}000f002d00000001000000000000"
+    )
+    return json.dumps(["2WL", str(len(records)), *records]).encode()
+
+
+async def _serve_device(latency: float, jitter: float) -> int:
+    frame = build_frame(5, 21, 22)
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request = await reader.read(1024)
+            await asyncio.sleep(max(0.0, random.gauss(latency, jitter)))
+            if request.startswith(b'["2WL"'):
+                writer.write(frame)
+            else:
+                writer.write(b'["2WC","1","00"]')
+            await writer.drain()
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0, backlog=128)
+    return server.sockets[0].getsockname()[1]
+
+
+def _simulator(count: int, latency: float, jitter: float, conn: Connection):
+    async def run():
+        ports = [await _serve_device(latency, jitter) for _ in range(count)]
+        conn.send(ports)
+        # Serve until the parent closes the pipe
+        await asyncio.get_running_loop().run_in_executor(None, conn.recv)
+
+    try:
+        asyncio.run(run())
+    except EOFError:
+        pass
+
+
+class _PolledDevice:
+    """Client side state of a simulated device."""
+
+    def __init__(self, port: int) -> None:
+        self.loader = _DeviceLoader()
+        self.loader.initiate(
+            {"comandi_term_princ": {"scritt_termostato": THERMOSTAT_POSITION}}
+        )
+        self.device = Device(self.loader)
+        self.client = TCPCommunication("127.0.0.1", port)
+
+
+async def _poll_round(
+    devices: list[_PolledDevice], semaphore: asyncio.Semaphore
+) -> tuple[list[float], int]:
+    latencies: list[float] = []
+    errors = 0
+
+    async def poll(polled: _PolledDevice):
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                polled.loader.load_from_local(
+                    polled.device, await polled.client.read_data()
+                )
+            except (TCPCommunicationError, DeviceDataLoadError):
+                errors += 1
+            else:
+                latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(poll(polled) for polled in devices))
+    return latencies, errors
+
+
+def _percentile(values: list[float], percent: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+
+async def run_step(ports: list[int], rounds: int, concurrency: int) -> dict:
+    """Poll all simulated devices for a number of rounds and measure."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    devices = [_PolledDevice(port) for port in ports]
+    # Decoded state is part of the footprint, so poll once before measuring
+    semaphore = asyncio.Semaphore(concurrency)
+    await _poll_round(devices, semaphore)
+    memory = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    latencies: list[float] = []
+    errors = 0
+    cpu_started = time.process_time()
+    started = time.perf_counter()
+    for _ in range(rounds):
+        round_latencies, round_errors = await _poll_round(devices, semaphore)
+        latencies.extend(round_latencies)
+        errors += round_errors
+    elapsed = time.perf_counter() - started
+    cpu = time.process_time() - cpu_started
+
+    polls = len(latencies) + errors
+    return {
+        "devices": len(ports),
+        "polls": polls,
+        "errors": errors,
+        "throughput": round(polls / elapsed, 1),
+        "cpu_ms_per_poll": round(cpu * 1000 / polls, 3) if polls else 0.0,
+        "memory_kib_per_device": round(memory / 1024 / len(ports), 2),
+        "p50": round(_percentile(latencies, 50), 4),
+        "p95": round(_percentile(latencies, 95), 4),
+        "p99": round(_percentile(latencies, 99), 4),
+        "max": round(max(latencies, default=0.0), 4),
+        "mean": round(statistics.fmean(latencies), 4) if latencies else 0.0,
+    }
+
+
+def main() -> None:
+    """Run the load test from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, nargs="+", default=[10, 50, 100])
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds")
+    parser.add_argument("--latency-jitter", type=float, default=0.02, help="seconds")
+    parser.add_argument(
+        "--concurrency", type=int, help="concurrent polls, defaults to all devices"
+    )
+    args = parser.parse_args()
+
+    for count in args.devices:
+        parent, child = multiprocessing.Pipe()
+        simulator = multiprocessing.Process(
+            target=_simulator,
+            args=(count, args.latency, args.latency_jitter, child),
+            daemon=True,
+        )
+        simulator.start()
+        child.close()
+        try:
+            ports = parent.recv()
+            result = asyncio.run(
+                run_step(ports, args.rounds, args.concurrency or count)
+            )
+            print(json.dumps(result))  # noqa: T201
+        finally:
+            parent.close()
+            simulator.join(timeout=5)
+            if simulator.is_alive():
+                simulator.terminate()
+
+
+if __name__ == "__main__":
+    main()
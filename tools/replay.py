@@ -0,0 +1,73 @@
+"""Replay 4Heat capture files through the decoder.
+
+Frames are fed to _DeviceLoader back to back, with no delay between them,
+so a capture doubles as a load generator for the decoder.
+
+Usage:
+    python -m tools.replay [--file-map map.json] frames.bin [...]
+"""
+
+import argparse
+import json
+import logging
+import time
+
+from .component import register
+
+register()
+
+from fourheat.capture import TRANSPORT_LOCAL, iter_frames  # noqa: E402
+from fourheat.device import Device, DeviceDataLoadError, _DeviceLoader  # noqa: E402
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def replay(paths: list[str], file_map: dict | None = None) -> dict[str, float]:
+    """Decode every frame of the given capture files and return the totals."""
+    loader = _DeviceLoader()
+    loader.initiate(file_map)
+    device = Device()
+
+    frames = 0
+    errors = 0
+    started = time.perf_counter()
+
+    for path in paths:
+        for _, transport, payload in iter_frames(path):
+            frames += 1
+            try:
+                if transport == TRANSPORT_LOCAL:
+                    loader.load_from_local(device, payload)
+                else:
+                    loader.load_from_cloud(device, json.loads(payload))
+            except DeviceDataLoadError as e:
+                errors += 1
+                _LOGGER.debug("Frame %s could not be decoded: %s", frames, e)
+
+    elapsed = time.perf_counter() - started
+
+    return {
+        "frames": frames,
+        "errors": errors,
+        "seconds": elapsed,
+        "frames_per_second": frames / elapsed if elapsed else 0.0,
+    }
+
+
+def main() -> None:
+    """Run the replay from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="+", help="capture files, oldest first")
+    parser.add_argument("--file-map", help="JSON file map of the device")
+    args = parser.parse_args()
+
+    file_map = None
+    if args.file_map:
+        with open(args.file_map, encoding="utf-8") as file:
+            file_map = json.load(file)
+
+    print(json.dumps(replay(args.paths, file_map)))  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()